@@ -1,10 +1,16 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser
+from .models import CustomUser, Follow
+
+class FollowerInline(admin.TabularInline):
+    model = Follow
+    fk_name = "user"
+    raw_id_fields = ("follower",)
+    extra = 0
 
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
     fieldsets = UserAdmin.fieldsets + (
-        ("Profile", {"fields": ("bio", "profile_picture", "followers")}),
+        ("Profile", {"fields": ("bio", "profile_picture")}),
     )
-    filter_horizontal = ("groups", "user_permissions", "followers")
+    inlines = [FollowerInline]
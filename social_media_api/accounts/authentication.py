@@ -0,0 +1,99 @@
+"""Token authentication that skips the token->user join on repeat requests.
+
+Entries live in the Django cache named by TOKEN_AUTH_CACHE_ALIAS ("shared" by default), so
+revocation is seen by every worker at once. With an empty alias they live in a bounded
+in-process LRU instead, and other workers only notice a revocation when their entry expires
+(TOKEN_AUTH_CACHE_TTL); use that for single-process deployments only. Two keys are
+stored: token digest -> user id, and user id -> user. Deleting a Token drops the first; saving,
+deactivating or deleting a user (or changing their follow counters) drops the second, and the
+next request falls back to the database check.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from social_media_api import metrics
+
+class LocalLRUCache:
+    """Minimal thread-safe LRU with per-entry expiry, exposing the cache calls used here."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+_local_cache = LocalLRUCache(settings.TOKEN_AUTH_CACHE_SIZE)
+
+def _store():
+    alias = settings.TOKEN_AUTH_CACHE_ALIAS
+    return caches[alias] if alias else _local_cache
+
+def _token_key(key):
+    # Never keep raw tokens as cache keys
+    return "auth:token:" + hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def _user_key(user_id):
+    return f"auth:user:{user_id}"
+
+def invalidate_tokens(keys):
+    _store().delete_many([_token_key(key) for key in keys])
+
+def invalidate_users(user_ids):
+    _store().delete_many([_user_key(user_id) for user_id in user_ids])
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in replacement for TokenAuthentication (same header, same errors)."""
+
+    def authenticate_credentials(self, key):
+        if not settings.TOKEN_AUTH_CACHE_TTL:
+            return super().authenticate_credentials(key)
+        store = _store()
+        token_key = _token_key(key)
+        user_id = store.get(token_key)
+        user = store.get(_user_key(user_id)) if user_id is not None else None
+        if user is not None:
+            metrics.incr("auth.cache_hit")
+            # Each request gets its own instance; views may mutate request.user
+            user = copy.copy(user)
+            return user, Token(key=key, user=user)
+
+        metrics.incr("auth.cache_miss")
+        user, token = super().authenticate_credentials(key)
+        store.set(token_key, user.pk, settings.TOKEN_AUTH_CACHE_TTL)
+        store.set(_user_key(user.pk), copy.copy(user), settings.TOKEN_AUTH_CACHE_TTL)
+        return user, token
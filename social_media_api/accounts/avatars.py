@@ -0,0 +1,101 @@
+"""Off-request avatar variants: fixed-size WebP/JPEG thumbnails of CustomUser.profile_picture.
+
+After the upload commits, an I/O thread reads the original from storage and hands the bytes to
+a process pool (AVATAR_WORKERS processes, default one per core) for decoding and resizing.
+It then writes the variants back under content-hashed names and records them in
+`avatar_variants` as {"<size>": {"webp": name, "jpg": name}}. Hashed names never change
+content, so they can be cached forever. AVATAR_PROCESSING_SYNC=True renders inline (tests, dev).
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+
+from social_media_api import metrics
+
+from .authentication import invalidate_users
+from .imaging import render_variants
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_process_pool = None
+_io_pool = None
+
+def _pools():
+    global _process_pool, _io_pool
+    with _lock:
+        if _process_pool is None:
+            workers = settings.AVATAR_WORKERS or os.cpu_count() or 1
+            # spawn: never fork a process that holds DB connections and server threads
+            _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _io_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="avatars")
+        return _process_pool, _io_pool
+
+def variant_name(user_id, digest, size, ext):
+    return f"avatars/{user_id}/{digest}-{size}.{ext}"
+
+def _store_variants(user, name, data, rendered):
+    storage = user.profile_picture.storage
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    variants = {}
+    for size, files in rendered.items():
+        variants[str(size)] = {}
+        for ext, content in files.items():
+            target = variant_name(user.pk, digest, size, ext)
+            if not storage.exists(target):
+                storage.save(target, ContentFile(content))
+            variants[str(size)][ext] = target
+    # Skip the write if another upload replaced the picture meanwhile
+    if get_user_model().objects.filter(pk=user.pk, profile_picture=name).update(avatar_variants=variants):
+        # update() sends no post_save; drop cached request.user copies without the variants
+        invalidate_users([user.pk])
+    return variants
+
+def process_avatar(user_id, name, render=None):
+    """Render and store the variants of `name` for `user_id`; `render` overrides the pool call."""
+    user = get_user_model().objects.filter(pk=user_id, profile_picture=name).first()
+    if user is None:
+        return None
+    with user.profile_picture.open("rb") as f:
+        data = f.read()
+    with metrics.timer("avatars.render"):
+        if render is None:
+            process_pool, _ = _pools()
+            rendered = process_pool.submit(render_variants, data, settings.AVATAR_VARIANT_SIZES).result()
+        else:
+            rendered = render(data, settings.AVATAR_VARIANT_SIZES)
+    return _store_variants(user, name, data, rendered)
+
+def _process_in_background(user_id, name):
+    try:
+        process_avatar(user_id, name)
+        metrics.incr("avatars.processed")
+    except Exception:
+        metrics.incr("avatars.failed")
+        logger.exception("Avatar processing failed for user %s (%s)", user_id, name)
+    finally:
+        # Pool threads are not request threads: release their connection explicitly
+        connection.close()
+
+def schedule_avatar_processing(user):
+    """Queue variant generation for the user's current picture once the transaction commits."""
+    name = user.profile_picture.name
+    if not name:
+        return
+
+    def run():
+        if settings.AVATAR_PROCESSING_SYNC:
+            process_avatar(user.pk, name, render=render_variants)
+        else:
+            _, io_pool = _pools()
+            io_pool.submit(_process_in_background, user.pk, name)
+
+    transaction.on_commit(run)
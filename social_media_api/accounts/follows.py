@@ -0,0 +1,75 @@
+"""Bulk follow/unfollow for onboarding flows ("follow these 50 accounts").
+
+Both helpers validate every target with one query and touch the Follow table with one
+statement. They send the same m2m_changed signals as `followers.add()/remove()`, so counters,
+the follow-graph index, timelines, suggestions and the response cache stay in sync.
+"""
+from django.contrib.auth import get_user_model
+from django.db import router, transaction
+from django.db.models.signals import m2m_changed
+
+from notifications.utils import notify_many
+
+from .models import Follow
+
+FOLLOWED = "followed"
+ALREADY_FOLLOWING = "already_following"
+UNFOLLOWED = "unfollowed"
+NOT_FOLLOWING = "not_following"
+NOT_FOUND = "not_found"
+SELF = "self"
+
+def _send(action, follower, pk_set):
+    User = get_user_model()
+    # Same shape as follower.following.add()/remove(): instance is the follower, reverse=True
+    m2m_changed.send(
+        sender=Follow, instance=follower, action=action, reverse=True, model=User, pk_set=pk_set,
+        using=router.db_for_write(Follow, instance=follower),
+    )
+
+def _resolve(follower, target_ids):
+    """Split requested ids into {id: status} for invalid targets and a list of valid ones."""
+    target_ids = list(dict.fromkeys(target_ids))
+    found = set(
+        get_user_model().objects.filter(id__in=target_ids, is_active=True).values_list("id", flat=True)
+    )
+    results, valid = {}, []
+    for target_id in target_ids:
+        if target_id == follower.pk:
+            results[target_id] = SELF
+        elif target_id not in found:
+            results[target_id] = NOT_FOUND
+        else:
+            valid.append(target_id)
+    return target_ids, results, valid
+
+def bulk_follow(follower, target_ids, verb="followed you"):
+    """Make `follower` follow every id in `target_ids`. Returns [(id, status)] in request order."""
+    target_ids, results, valid = _resolve(follower, target_ids)
+    existing = set(Follow.objects.filter(follower=follower, user_id__in=valid).values_list("user_id", flat=True))
+    new_ids = {target_id for target_id in valid if target_id not in existing}
+    if new_ids:
+        with transaction.atomic():
+            _send("pre_add", follower, new_ids)
+            # A concurrent follow of the same pair is skipped by the unique constraint;
+            # repair_follow_counters fixes the counter drift that race could leave behind
+            Follow.objects.bulk_create(
+                [Follow(user_id=target_id, follower=follower) for target_id in new_ids], ignore_conflicts=True
+            )
+            _send("post_add", follower, new_ids)
+            User = get_user_model()
+            notify_many([(User(pk=target_id), follower, verb, None) for target_id in sorted(new_ids)])
+    for target_id in valid:
+        results[target_id] = FOLLOWED if target_id in new_ids else ALREADY_FOLLOWING
+    return [(target_id, results[target_id]) for target_id in target_ids]
+
+def bulk_unfollow(follower, target_ids):
+    """Make `follower` unfollow every id in `target_ids`. Returns [(id, status)] in request order."""
+    target_ids, results, valid = _resolve(follower, target_ids)
+    existing = set(Follow.objects.filter(follower=follower, user_id__in=valid).values_list("user_id", flat=True))
+    if existing:
+        with transaction.atomic():
+            follower.following.remove(*existing)
+    for target_id in valid:
+        results[target_id] = UNFOLLOWED if target_id in existing else NOT_FOLLOWING
+    return [(target_id, results[target_id]) for target_id in target_ids]
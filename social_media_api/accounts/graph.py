@@ -0,0 +1,157 @@
+"""Compact in-process index of the follow graph.
+
+Each user maps to two sorted `array("q")` adjacency lists (followed ids and follower ids), so
+counts are O(1) (`len`) and "does A follow B" is a binary search, all without a query.
+The index is loaded lazily with one scan of the followers through table, kept current by
+follow/unfollow in this process (m2m_changed, after commit) and fully reloaded every
+FOLLOW_GRAPH_TTL seconds to pick up changes made by other processes. Only the first load
+blocks (once per process); later reloads run in a background thread while readers keep the
+current snapshot.
+"""
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Follow
+
+logger = logging.getLogger(__name__)
+
+_EMPTY = array("q")
+
+def follow_edges(instance, reverse, pk_set):
+    """Normalize a followers m2m change into (follower_ids, followed_ids)."""
+    # target.followers.add(user) -> instance is the followed user (reverse=False)
+    # user.following.add(target) -> instance is the follower (reverse=True)
+    if reverse:
+        return [instance.pk], list(pk_set)
+    return list(pk_set), [instance.pk]
+
+def _contains(values, value):
+    i = bisect_left(values, value)
+    return i < len(values) and values[i] == value
+
+class FollowGraph:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # single flight: one scan at a time per process
+        self._following = {}
+        self._followers = {}
+        self._loaded_at = None
+        self._stale = False
+        self._refreshing = False
+        # Edge changes applied while a reload scans, replayed onto the new snapshot
+        self._pending = None
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None:
+            with self._load_lock:
+                if self._loaded_at is None:
+                    self.load()
+        elif self._stale or time.monotonic() - self._loaded_at > settings.FOLLOW_GRAPH_TTL:
+            self._refresh_in_background()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="follow-graph-reload", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            with self._load_lock:
+                self.load()
+        except Exception:
+            # Keep serving the old snapshot; the next read after the TTL retries
+            logger.exception("Follow graph reload failed")
+            with self._lock:
+                self._loaded_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._refreshing = False
+            connection.close()
+
+    def load(self):
+        with self._lock:
+            self._pending = []
+        following, followers = {}, {}
+        try:
+            # Ordering by (follower, followed) yields both adjacency lists already sorted
+            edges = Follow.objects.order_by("follower_id", "user_id").values_list("follower_id", "user_id")
+            for follower_id, followed_id in edges.iterator(chunk_size=10000):
+                following.setdefault(follower_id, array("q")).append(followed_id)
+                followers.setdefault(followed_id, array("q")).append(follower_id)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for apply, follower_ids, followed_ids in self._pending:
+                apply(following, followers, follower_ids, followed_ids)
+            self._following, self._followers = following, followers
+            self._pending = None
+            self._loaded_at = time.monotonic()
+            self._stale = False
+
+    def following_count(self, user_id):
+        self._ensure_loaded()
+        return len(self._following.get(user_id, _EMPTY))
+
+    def followers_count(self, user_id):
+        self._ensure_loaded()
+        return len(self._followers.get(user_id, _EMPTY))
+
+    def is_following(self, follower_id, followed_id):
+        self._ensure_loaded()
+        return _contains(self._following.get(follower_id, _EMPTY), followed_id)
+
+    def add(self, follower_ids, followed_ids):
+        self._apply(self._add, follower_ids, followed_ids)
+
+    def remove(self, follower_ids, followed_ids):
+        self._apply(self._remove, follower_ids, followed_ids)
+
+    def invalidate(self):
+        """Reload on the next read (in the background once a snapshot exists)."""
+        self._stale = True
+
+    def _apply(self, apply, follower_ids, followed_ids):
+        with self._lock:
+            apply(self._following, self._followers, follower_ids, followed_ids)
+            if self._pending is not None:
+                self._pending.append((apply, follower_ids, followed_ids))
+
+    @classmethod
+    def _add(cls, following, followers, follower_ids, followed_ids):
+        for a in follower_ids:
+            for b in followed_ids:
+                cls._insert(following, a, b)
+                cls._insert(followers, b, a)
+
+    @classmethod
+    def _remove(cls, following, followers, follower_ids, followed_ids):
+        for a in follower_ids:
+            for b in followed_ids:
+                cls._delete(following, a, b)
+                cls._delete(followers, b, a)
+
+    @staticmethod
+    def _insert(index, key, value):
+        values = index.setdefault(key, array("q"))
+        if not _contains(values, value):
+            insort(values, value)
+
+    @staticmethod
+    def _delete(index, key, value):
+        values = index.get(key)
+        if values is not None:
+            i = bisect_left(values, value)
+            if i < len(values) and values[i] == value:
+                del values[i]
+
+follow_graph = FollowGraph()
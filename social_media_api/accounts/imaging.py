@@ -0,0 +1,23 @@
+"""Pure Pillow avatar resizing, run inside worker processes (no Django imports here)."""
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+FORMATS = (("webp", "WEBP", {"quality": 80, "method": 4}), ("jpg", "JPEG", {"quality": 85, "optimize": True}))
+
+def render_variants(data, sizes):
+    """Square-crop `data` (any Pillow-readable image) to each size.
+
+    Returns {size: {ext: bytes}} with a WebP and a JPEG rendition per size.
+    """
+    with Image.open(BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original).convert("RGB")
+    variants = {}
+    for size in sorted(set(sizes), reverse=True):
+        thumb = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        variants[size] = {}
+        for ext, fmt, options in FORMATS:
+            out = BytesIO()
+            thumb.save(out, fmt, **options)
+            variants[size][ext] = out.getvalue()
+    return variants
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from accounts.suggestions import compute_suggestions
+
+class Command(BaseCommand):
+    help = "Compute \"people you may know\" suggestions from the follow graph (sparse matrix products)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--incremental", action="store_true", help="Only users marked stale or never computed.")
+        parser.add_argument("--user", type=int, action="append", dest="user_ids", help="Only recompute these user ids.")
+        parser.add_argument("--top-k", type=int, default=settings.SUGGESTIONS_TOP_K, help="Suggestions kept per user.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users scored per matrix block.")
+
+    def handle(self, *args, incremental=False, user_ids=None, top_k=None, batch_size=1000, **options):
+        if incremental and not user_ids:
+            user_ids = list(
+                get_user_model().objects.filter(Q(suggestion_set__isnull=True) | Q(suggestion_set__is_stale=True))
+                .values_list("id", flat=True)
+            )
+            if not user_ids:
+                self.stdout.write(self.style.SUCCESS("No stale suggestions."))
+                return
+        written = compute_suggestions(user_ids, k=top_k or settings.SUGGESTIONS_TOP_K, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Computed suggestions for {written} users."))
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from accounts import avatars
+from accounts.imaging import render_variants
+
+class Command(BaseCommand):
+    help = "Generate missing avatar thumbnails/WebP variants, spreading the resizing over all cores."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Regenerate variants that already exist too.")
+        parser.add_argument("--batch-size", type=int, default=100, help="Pictures rendered in parallel per batch.")
+
+    def handle(self, *args, all=False, batch_size=100, **options):
+        qs = get_user_model().objects.exclude(profile_picture="").exclude(profile_picture__isnull=True)
+        if not all:
+            qs = qs.filter(avatar_variants={})
+        process_pool, _ = avatars._pools()
+        sizes = settings.AVATAR_VARIANT_SIZES
+        last_id, done, failed = 0, 0, 0
+        while True:
+            users = list(qs.filter(id__gt=last_id).order_by("id")[:batch_size])
+            if not users:
+                break
+            last_id = users[-1].id
+            jobs = []
+            for user in users:
+                with user.profile_picture.open("rb") as f:
+                    data = f.read()
+                jobs.append((user, data, process_pool.submit(render_variants, data, sizes)))
+            for user, data, future in jobs:
+                try:
+                    avatars._store_variants(user, user.profile_picture.name, data, future.result())
+                    done += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"user {user.id}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Generated variants for {done} users ({failed} failed)."))
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts import uploads
+from accounts.models import UploadSession
+
+class Command(BaseCommand):
+    help = "Delete upload sessions (and their stored parts) older than UPLOAD_SESSION_TTL_HOURS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=None, help="Age in hours (default UPLOAD_SESSION_TTL_HOURS).")
+        parser.add_argument("--batch-size", type=int, default=500, help="Sessions loaded per query.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be deleted.")
+
+    def handle(self, *args, hours=None, batch_size=500, dry_run=False, **options):
+        hours = settings.UPLOAD_SESSION_TTL_HOURS if hours is None else hours
+        expired = UploadSession.objects.filter(created_at__lt=timezone.now() - timedelta(hours=hours))
+        if dry_run:
+            self.stdout.write(f"{expired.count()} upload sessions older than {hours} hours would be deleted.")
+            return
+        deleted = 0
+        for session in expired.iterator(chunk_size=batch_size):
+            uploads.abort(session)
+            deleted += 1
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} upload sessions older than {hours} hours."))
@@ -0,0 +1,52 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from accounts.models import Follow
+
+def _count_edges(column):
+    counted = Follow.objects.filter(**{column: OuterRef("pk")}).order_by().values(column).annotate(n=Count("id")).values("n")
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+class Command(BaseCommand):
+    help = "Repair drift in CustomUser.followers_count / following_count, one id range at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users checked per batch.")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing.")
+
+    def handle(self, *args, batch_size=1000, sleep=0.0, dry_run=False, **options):
+        User = get_user_model()
+        actual_followers, actual_following = _count_edges("user"), _count_edges("follower")
+        last_id, checked, repaired = 0, 0, 0
+        while True:
+            ids = list(User.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            checked += len(ids)
+
+            drifted = list(
+                User.objects.filter(id__in=ids)
+                .annotate(actual_followers=actual_followers, actual_following=actual_following)
+                .exclude(followers_count=F("actual_followers"), following_count=F("actual_following"))
+                .values_list("id", "followers_count", "actual_followers", "following_count", "actual_following")
+            )
+            if drifted and not dry_run:
+                # Recount inside the UPDATE so concurrent F() adjustments are not overwritten
+                User.objects.filter(id__in=[row[0] for row in drifted]).update(
+                    followers_count=actual_followers, following_count=actual_following
+                )
+            repaired += len(drifted)
+            if options["verbosity"] > 1:
+                for user_id, followers, actual_f, following, actual_g in drifted:
+                    self.stdout.write(f"user {user_id}: followers {followers}->{actual_f}, following {following}->{actual_g}")
+            if sleep:
+                time.sleep(sleep)
+
+        verb = "Found" if dry_run else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} users. {verb} {repaired} with drift."))
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:09
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='avatar_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        # The follow edges already live in the auto-created m2m table. Follow takes it over in
+        # the migration state only; created_at, the constraint and the indexes are real changes.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Follow',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('follower', models.ForeignKey(db_column='to_customuser_id', on_delete=django.db.models.deletion.CASCADE, related_name='following_edges', to=settings.AUTH_USER_MODEL)),
+                        ('user', models.ForeignKey(db_column='from_customuser_id', on_delete=django.db.models.deletion.CASCADE, related_name='follower_edges', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'accounts_customuser_followers',
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='customuser',
+                    name='followers',
+                    field=models.ManyToManyField(blank=True, related_name='following', through='accounts.Follow', through_fields=('user', 'follower'), to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        # Existing follows get the migration time
+        migrations.AddField(
+            model_name='follow',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='SuggestionSet',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='suggestion_set', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('suggested_ids', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('is_stale', models.BooleanField(default=False)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('is_stale', True)), fields=['user'], name='suggestion_stale_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('parts', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['user', '-id'], name='follow_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['follower', '-id'], name='follow_follower_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.UniqueConstraint(fields=('user', 'follower'), name='unique_follow_per_user_follower'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadsession',
+            index=models.Index(fields=['created_at'], name='upload_session_created_idx'),
+        ),
+    ]
@@ -1,11 +1,16 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 class CustomUser(AbstractUser):
     bio = models.TextField(blank=True)
 
     # Required by checker: ImageField
     profile_picture = models.ImageField(upload_to="profile_pictures/", blank=True, null=True)
+    # {"<size>": {"webp": name, "jpg": name}} generated off-request by accounts.avatars
+    avatar_variants = models.JSONField(default=dict, blank=True)
 
     # Required by task statement: followers ManyToMany referencing itself, symmetrical=False
     followers = models.ManyToManyField(
@@ -13,7 +18,90 @@ class CustomUser(AbstractUser):
         symmetrical=False,
         related_name="following",
         blank=True,
+        through="Follow",
+        through_fields=("user", "follower"),
     )
 
+    # Denormalized sizes of the follow graph, kept current by the followers m2m_changed receiver;
+    # `python manage.py repair_follow_counters` fixes drift
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+
     def __str__(self):
         return self.username
+
+class Follow(models.Model):
+    """Edge of the follow graph: `follower` follows `user` (through table of CustomUser.followers).
+
+    Mapped onto the table and columns of the former auto-created m2m, so existing follows are kept;
+    rows from before `created_at` existed get the migration time.
+    """
+
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="follower_edges", db_column="from_customuser_id"
+    )
+    follower = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="following_edges", db_column="to_customuser_id"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "accounts_customuser_followers"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "follower"], name="unique_follow_per_user_follower")
+        ]
+        # Keyset pagination of followers/following lists, newest edge first
+        indexes = [
+            models.Index(fields=["user", "-id"], name="follow_user_idx"),
+            models.Index(fields=["follower", "-id"], name="follow_follower_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.follower_id} follows {self.user_id}"
+
+class SuggestionSet(models.Model):
+    """Ranked "people you may know" user ids, precomputed by `manage.py compute_suggestions`."""
+
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name="suggestion_set")
+    suggested_ids = models.JSONField(default=list)
+    computed_at = models.DateTimeField(null=True, blank=True)
+    # Set when the user follows/unfollows or gains/loses a follower; `--incremental` recomputes these
+    is_stale = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user"], condition=models.Q(is_stale=True), name="suggestion_stale_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {len(self.suggested_ids)} suggestions"
+
+class UploadSession(models.Model):
+    """Resumable chunked profile picture upload; parts live in storage until it is completed."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="upload_sessions")
+    filename = models.CharField(max_length=255)
+    # Declared total size in bytes; completion fails unless the parts add up to it
+    size = models.PositiveBigIntegerField()
+    # {"<part number>": <bytes received>}
+    parts = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["created_at"], name="upload_session_created_idx")]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.filename} ({self.received}/{self.size})"
+
+    @property
+    def received(self):
+        return sum(self.parts.values())
+
+    @property
+    def part_prefix(self):
+        return f"uploads/{self.id}/"
+
+    def part_name(self, number):
+        return f"{self.part_prefix}{number:05d}.part"
@@ -1,22 +1,72 @@
+from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
 
+from .avatars import schedule_avatar_processing
+from .graph import follow_graph
+from .models import UploadSession
+
 User = get_user_model()
 
 class UserPublicSerializer(serializers.ModelSerializer):
-    followers_count = serializers.SerializerMethodField()
-    following_count = serializers.SerializerMethodField()
+    is_following = serializers.SerializerMethodField()
+    avatar = serializers.SerializerMethodField()
 
     class Meta:
         model = User
-        fields = ["id", "username", "bio", "profile_picture", "followers_count", "following_count"]
+        fields = [
+            "id", "username", "bio", "profile_picture", "avatar", "followers_count", "following_count", "is_following",
+        ]
+        read_only_fields = ["followers_count", "following_count"]
+
+    def get_avatar(self, obj):
+        """Resized variant URLs as {"<size>": {"webp": url, "jpg": url}}; empty until processed."""
+        request = self.context.get("request")
+        storage = obj.profile_picture.storage
+        urls = {}
+        for size, files in (obj.avatar_variants or {}).items():
+            urls[size] = {}
+            for ext, name in files.items():
+                url = storage.url(name)
+                urls[size][ext] = request.build_absolute_uri(url) if request else url
+        return urls
+
+    def get_is_following(self, obj):
+        """Whether the requesting user follows `obj` (None when anonymous or looking at yourself).
+
+        Answered from the in-process follow graph index, without a query.
+        """
+        request = self.context.get("request")
+        if not (request and request.user.is_authenticated) or request.user.pk == obj.pk:
+            return None
+        return follow_graph.is_following(request.user.pk, obj.pk)
+
+class UserListItemSerializer(UserPublicSerializer):
+    """Slim user row for followers/following lists."""
+
+    class Meta(UserPublicSerializer.Meta):
+        fields = ["id", "username", "profile_picture", "avatar", "is_following"]
 
-    def get_followers_count(self, obj):
-        return obj.followers.count()
+class BulkFollowSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=100)
 
-    def get_following_count(self, obj):
-        return obj.following.count()
+class UploadSessionSerializer(serializers.ModelSerializer):
+    received = serializers.IntegerField(read_only=True)
+    part_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ["id", "filename", "size", "parts", "received", "part_size", "created_at", "completed_at"]
+        read_only_fields = ["parts", "created_at", "completed_at"]
+
+    def get_part_size(self, obj):
+        return settings.UPLOAD_PART_MAX_SIZE
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Size must be between 1 and {settings.UPLOAD_MAX_SIZE} bytes.")
+        return value
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=6)
@@ -51,3 +101,13 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["bio", "profile_picture", "email", "first_name", "last_name"]
+
+    def update(self, instance, validated_data):
+        picture_changed = "profile_picture" in validated_data
+        if picture_changed:
+            # Old variants belong to the old picture; new ones are generated off-request
+            instance.avatar_variants = {}
+        instance = super().update(instance, validated_data)
+        if picture_changed:
+            schedule_avatar_processing(instance)
+        return instance
@@ -1,9 +1,80 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from rest_framework.authtoken.models import Token
 
+from .authentication import invalidate_tokens, invalidate_users
+from .graph import follow_edges, follow_graph
+from .models import SuggestionSet
+
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_auth_token(sender, instance=None, created=False, **kwargs):
     if created:
         Token.objects.create(user=instance)
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers deactivation (is_active=False) and profile edits
+    invalidate_users([instance.pk])
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    invalidate_tokens([instance.key])
+
+@receiver(m2m_changed, sender=get_user_model().followers.through)
+def update_follow_graph(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "post_clear":
+        # update_follow_counters recorded the cleared ids on pre_clear
+        pk_set = getattr(instance, "_removed_follow_ids", None)
+    elif action not in ("post_add", "post_remove"):
+        return
+    if not pk_set:
+        return
+    follower_ids, followed_ids = follow_edges(instance, reverse, pk_set)
+    apply = follow_graph.add if action == "post_add" else follow_graph.remove
+    transaction.on_commit(lambda: apply(follower_ids, followed_ids))
+
+# Registered before update_follow_counters, which resets _removed_follow_ids on post_clear
+@receiver(m2m_changed, sender=get_user_model().followers.through)
+def mark_suggestions_stale(sender, instance, action, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    changed = getattr(instance, "_removed_follow_ids", None) if action == "post_clear" else pk_set
+    if changed:
+        SuggestionSet.objects.filter(pk__in={instance.pk, *(changed or ())}, is_stale=False).update(is_stale=True)
+
+def _counter(field, delta):
+    # Two concurrent unfollows of one edge can both see it in pre_remove; never go below zero
+    if delta >= 0:
+        return F(field) + delta
+    return Greatest(F(field) + delta, Value(0))
+
+def _adjust_follow_counters(follower_ids, followed_ids, sign):
+    User = get_user_model()
+    if not (follower_ids and followed_ids):
+        return
+    User.objects.filter(pk__in=followed_ids).update(followers_count=_counter("followers_count", sign * len(follower_ids)))
+    User.objects.filter(pk__in=follower_ids).update(following_count=_counter("following_count", sign * len(followed_ids)))
+    # update() sends no post_save; drop cached request.user copies holding the old counters
+    invalidate_users([*follower_ids, *followed_ids])
+
+@receiver(m2m_changed, sender=get_user_model().followers.through)
+def update_follow_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "post_add" and pk_set:
+        # pk_set only holds the edges that were actually inserted
+        _adjust_follow_counters(*follow_edges(instance, reverse, pk_set), 1)
+    elif action in ("pre_remove", "pre_clear"):
+        # remove()/clear() report requested ids; decrement only edges that exist
+        related = instance.following if reverse else instance.followers
+        if pk_set is not None:
+            related = related.filter(pk__in=pk_set)
+        instance._removed_follow_ids = set(related.values_list("pk", flat=True))
+    elif action in ("post_remove", "post_clear"):
+        removed = getattr(instance, "_removed_follow_ids", None)
+        if removed:
+            _adjust_follow_counters(*follow_edges(instance, reverse, removed), -1)
+        instance._removed_follow_ids = None
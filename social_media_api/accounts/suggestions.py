@@ -0,0 +1,82 @@
+"""Batch "people you may know" scoring over the whole follow graph.
+
+A is the n x n sparse adjacency matrix (A[i, j] = 1 when i follows j). For a block of rows R:
+
+    scores = A[R] @ A      friends of friends: accounts followed by the people i follows
+           + A.T[R] @ A    shared followers: accounts also followed by the people following i
+
+Accounts i already follows (and i itself) are masked out, then the top-K columns of every row
+are picked with one lexsort over the block's non-zeros. Results are stored in SuggestionSet,
+which the `suggestions/` endpoint reads with a primary-key lookup.
+"""
+import numpy as np
+from scipy import sparse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .models import Follow, SuggestionSet
+
+def _index(ids, values):
+    """Positions of `values` in the sorted `ids`, and a mask of the values actually present."""
+    pos = np.clip(np.searchsorted(ids, values), 0, max(len(ids) - 1, 0))
+    return pos, (ids[pos] == values) if len(ids) else np.zeros(len(values), dtype=bool)
+
+def load_graph():
+    """Return (sorted user ids, CSR adjacency matrix) built from one scan of the Follow table."""
+    edges = Follow.objects.values_list("follower_id", "user_id").iterator(chunk_size=10000)
+    pairs = np.fromiter((v for edge in edges for v in edge), dtype=np.int64).reshape(-1, 2)
+    ids = np.fromiter(
+        get_user_model().objects.order_by("id").values_list("id", flat=True).iterator(chunk_size=10000), dtype=np.int64
+    )
+    rows, row_ok = _index(ids, pairs[:, 0])
+    cols, col_ok = _index(ids, pairs[:, 1])
+    # Edges of users created/deleted between the two scans are dropped
+    keep = row_ok & col_ok
+    n = len(ids)
+    matrix = sparse.csr_matrix(
+        (np.ones(int(keep.sum()), dtype=np.float32), (rows[keep], cols[keep])), shape=(n, n)
+    )
+    return ids, matrix
+
+def top_k(A, At, rows, k):
+    """Top-k candidate column indices for each row index in `rows`, best first."""
+    follows = A[rows]
+    scores = (follows @ A + At[rows] @ A).tocsr()
+    scores = (scores - scores.multiply(follows)).tocoo()
+    keep = (scores.data > 0) & (scores.col != rows[scores.row])
+    r, c, s = scores.row[keep], scores.col[keep], scores.data[keep]
+    # Sort by row, then score descending, then column for stable ties; rank within each row
+    order = np.lexsort((c, -s, r))
+    r, c = r[order], c[order]
+    starts = np.searchsorted(r, np.arange(len(rows)))
+    top = (np.arange(len(r)) - starts[r]) < k
+    r, c = r[top], c[top]
+    return np.split(c, np.searchsorted(r, np.arange(1, len(rows))))
+
+def compute_suggestions(user_ids=None, k=20, batch_size=1000):
+    """Recompute and store suggestions for `user_ids` (all users when None). Returns rows written."""
+    ids, A = load_graph()
+    At = A.T.tocsr()
+    if user_ids is None:
+        targets = np.arange(len(ids))
+    else:
+        wanted = np.unique(np.asarray(list(user_ids), dtype=np.int64))
+        pos, ok = _index(ids, wanted)
+        targets = pos[ok]
+
+    written = 0
+    for start in range(0, len(targets), batch_size):
+        rows = targets[start:start + batch_size]
+        now = timezone.now()
+        objs = [
+            SuggestionSet(user_id=int(ids[row]), suggested_ids=ids[cols].tolist(), computed_at=now, is_stale=False)
+            for row, cols in zip(rows, top_k(A, At, rows, k))
+        ]
+        SuggestionSet.objects.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["suggested_ids", "computed_at", "is_stale"],
+        )
+        written += len(objs)
+    return written
@@ -0,0 +1,50 @@
+import tempfile
+from io import BytesIO
+
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .models import CustomUser
+
+
+def png(size=(400, 300)):
+    out = BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(out, "PNG")
+    return SimpleUploadedFile("me.png", out.getvalue(), content_type="image/png")
+
+
+@override_settings(AVATAR_PROCESSING_SYNC=True, MEDIA_SERVE_MODE="django")
+class AvatarVariantTests(APITestCase):
+    def setUp(self):
+        caches["shared"].clear()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        overrides = override_settings(MEDIA_ROOT=media_root.name)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.user = CustomUser.objects.create_user("a", password="pass12345")
+        # Token auth, so request.user goes through the cached authentication
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.get(user=self.user).key}")
+
+    def test_variants_rendered_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch("/api/accounts/profile", {"profile_picture": png()}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(set(self.user.avatar_variants), {"64", "128", "256"})
+        with self.user.profile_picture.storage.open(self.user.avatar_variants["128"]["webp"]) as f:
+            self.assertEqual(Image.open(f).size, (128, 128))
+
+    def test_cached_user_sees_new_variants(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.patch("/api/accounts/profile", {"profile_picture": png()}, format="multipart")
+        # A request lands before rendering finishes and re-caches the user
+        self.assertEqual(self.client.get("/api/accounts/profile").data["avatar"], {})
+        for callback in callbacks:
+            callback()
+        avatar = self.client.get("/api/accounts/profile").data["avatar"]
+        self.assertTrue(avatar["64"]["jpg"].startswith("http://testserver/media/avatars/"))
@@ -0,0 +1,62 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models.signals import m2m_changed
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from .models import CustomUser
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False)
+class FollowCounterTests(APITestCase):
+    """followers_count / following_count follow every m2m path and can be repaired."""
+
+    def setUp(self):
+        self.a = CustomUser.objects.create_user("a", password="pass12345")
+        self.b = CustomUser.objects.create_user("b", password="pass12345")
+        self.c = CustomUser.objects.create_user("c", password="pass12345")
+
+    def counts(self):
+        users = CustomUser.objects.order_by("username").values_list("followers_count", "following_count")
+        return list(users)
+
+    def test_follow_endpoints_are_idempotent(self):
+        self.client.force_authenticate(self.a)
+        self.client.post(f"/api/accounts/follow/{self.b.id}/")
+        self.client.post(f"/api/accounts/follow/{self.b.id}/")
+        self.client.post(f"/api/accounts/unfollow/{self.c.id}/")
+        self.assertEqual(self.counts(), [(0, 1), (1, 0), (0, 0)])
+
+    def test_m2m_add_remove_clear(self):
+        self.c.following.add(self.a, self.b)
+        self.b.followers.remove(self.c)
+        self.assertEqual(self.counts(), [(1, 0), (0, 0), (0, 1)])
+        self.c.following.clear()
+        self.assertEqual(self.counts(), [(0, 0), (0, 0), (0, 0)])
+
+    def test_bulk_follow(self):
+        self.client.force_authenticate(self.a)
+        self.client.post("/api/accounts/follow/bulk/", {"user_ids": [self.b.id, self.c.id, self.b.id]}, format="json")
+        self.assertEqual(self.counts(), [(0, 2), (1, 0), (1, 0)])
+        self.client.post("/api/accounts/unfollow/bulk/", {"user_ids": [self.b.id]}, format="json")
+        self.assertEqual(self.counts(), [(0, 1), (0, 0), (1, 0)])
+
+    def test_repair_command(self):
+        self.b.followers.add(self.a, self.c)
+        CustomUser.objects.update(followers_count=7)
+        call_command("repair_follow_counters", stdout=StringIO())
+        self.assertEqual(self.counts(), [(0, 1), (2, 0), (0, 1)])
+
+    def test_racing_unfollows_never_go_negative(self):
+        # Replays two requests that both saw the edge in pre_remove, then both delete it
+        self.a.following.add(self.b)
+        removed = [set(self.a.following.values_list("pk", flat=True)) for _ in range(2)]
+        self.a.following.through.objects.filter(user=self.b, follower=self.a).delete()
+        for ids in removed:
+            self.a._removed_follow_ids = ids
+            m2m_changed.send(
+                sender=CustomUser.followers.through, instance=self.a, action="post_remove",
+                reverse=True, model=CustomUser, pk_set=ids,
+            )
+        self.assertEqual(self.counts(), [(0, 0), (0, 0), (0, 0)])
@@ -0,0 +1,53 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from .graph import follow_graph
+from .models import CustomUser
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False)
+class FollowListTests(APITestCase):
+    def setUp(self):
+        self.star = CustomUser.objects.create_user("star", password="pass12345")
+        self.fans = [CustomUser.objects.create_user(f"fan{i:02d}", password="pass12345") for i in range(12)]
+        for fan in self.fans:
+            self.star.followers.add(fan)
+        self.fans[0].following.add(self.fans[1], self.fans[2])
+        follow_graph.load()
+
+    def walk(self, url):
+        usernames = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            usernames += [u["username"] for u in response.data["results"]]
+            url = response.data["next"]
+        return usernames
+
+    def test_followers_newest_first_across_pages(self):
+        first = self.client.get(f"/api/accounts/users/{self.star.id}/followers/")
+        self.assertEqual(len(first.data["results"]), 10)
+        usernames = self.walk(f"/api/accounts/users/{self.star.id}/followers/")
+        self.assertEqual(usernames, [f.username for f in reversed(self.fans)])
+
+    def test_following(self):
+        usernames = self.walk(f"/api/accounts/users/{self.fans[0].id}/following/")
+        self.assertEqual(usernames, ["fan02", "fan01", "star"])
+
+    def test_is_following_is_relative_to_the_viewer(self):
+        self.client.force_authenticate(self.fans[0])
+        response = self.client.get(f"/api/accounts/users/{self.fans[0].id}/following/")
+        self.assertEqual([u["is_following"] for u in response.data["results"]], [True, True, True])
+        response = self.client.get(f"/api/accounts/users/{self.star.id}/followers/")
+        flags = {u["username"]: u["is_following"] for u in response.data["results"]}
+        self.assertEqual((flags["fan02"], flags["fan03"]), (True, False))
+
+    def test_unfollow_drops_the_edge(self):
+        self.client.force_authenticate(self.fans[5])
+        self.client.post(f"/api/accounts/unfollow/{self.star.id}/")
+        usernames = self.walk(f"/api/accounts/users/{self.star.id}/followers/")
+        self.assertNotIn("fan05", usernames)
+        self.assertEqual(len(usernames), 11)
+
+    def test_unknown_user(self):
+        self.assertEqual(self.client.get("/api/accounts/users/999999/followers/").status_code, 404)
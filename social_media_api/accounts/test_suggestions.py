@@ -0,0 +1,92 @@
+import random
+from io import StringIO
+
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from .graph import follow_graph
+from .models import CustomUser, SuggestionSet
+from .suggestions import compute_suggestions, load_graph
+
+
+def stored(user):
+    return SuggestionSet.objects.get(user=user).suggested_ids
+
+
+class SuggestionScoringTests(TestCase):
+    def setUp(self):
+        names = ["me", "a", "b", "x", "y", "z", "w"]
+        self.u = {name: CustomUser.objects.create_user(name, password="pass12345") for name in names}
+        follows = [("me", "a"), ("me", "b"), ("a", "x"), ("a", "y"), ("b", "x"), ("z", "me"), ("z", "w")]
+        for follower, followed in follows:
+            self.u[followed].followers.add(self.u[follower])
+
+    def ids(self, *names):
+        return [self.u[name].pk for name in names]
+
+    def test_friends_of_friends_and_shared_followers(self):
+        compute_suggestions()
+        # x: followed by a and b; y: by a; w: also followed by z, who follows me. Ties break on id.
+        self.assertEqual(stored(self.u["me"]), self.ids("x", "y", "w"))
+        self.assertNotIn(self.u["me"].pk, stored(self.u["z"]))
+
+    def test_top_k_and_batches(self):
+        compute_suggestions(k=2, batch_size=1)
+        self.assertEqual(stored(self.u["me"]), self.ids("x", "y"))
+        by_row = dict(SuggestionSet.objects.values_list("user_id", "suggested_ids"))
+        compute_suggestions(k=2)
+        self.assertEqual(dict(SuggestionSet.objects.values_list("user_id", "suggested_ids")), by_row)
+
+    def test_matches_dense_scoring_on_a_random_graph(self):
+        rng = random.Random(7)
+        users = list(self.u.values()) + [CustomUser.objects.create_user(f"r{i}", password="pass12345") for i in range(25)]
+        for follower in users:
+            follower.following.add(*rng.sample(users, 4))
+        compute_suggestions(k=5, batch_size=8)
+
+        ids, matrix = load_graph()
+        dense = matrix.toarray()
+        scores = dense @ dense + dense.T @ dense
+        scores[dense > 0] = 0
+        np.fill_diagonal(scores, 0)
+        for row, user_id in enumerate(ids):
+            columns = [c for c in np.lexsort((np.arange(len(ids)), -scores[row])) if scores[row, c] > 0][:5]
+            self.assertEqual(SuggestionSet.objects.get(user_id=user_id).suggested_ids, ids[columns].tolist())
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False)
+class SuggestionsEndpointTests(APITestCase):
+    def setUp(self):
+        self.me = CustomUser.objects.create_user("me", password="pass12345")
+        self.friend = CustomUser.objects.create_user("friend", password="pass12345")
+        self.others = [CustomUser.objects.create_user(f"other{i}", password="pass12345") for i in range(3)]
+        self.friend.followers.add(self.me)
+        self.friend.following.add(*self.others)
+        call_command("compute_suggestions", stdout=StringIO())
+        follow_graph.load()
+        self.client.force_authenticate(self.me)
+
+    def usernames(self):
+        return [u["username"] for u in self.client.get("/api/accounts/suggestions/").data["results"]]
+
+    def test_one_lookup_and_followed_accounts_drop_out(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.usernames(), ["other0", "other1", "other2"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/accounts/follow/{self.others[0].id}/")
+        self.assertEqual(self.usernames(), ["other1", "other2"])
+        self.assertTrue(SuggestionSet.objects.get(user=self.me).is_stale)
+
+    def test_incremental_recomputes_only_stale_users(self):
+        CustomUser.objects.filter(pk=self.others[1].pk).update(is_active=False)
+        self.assertEqual(self.usernames(), ["other0", "other2"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/accounts/follow/{self.others[0].id}/")
+        out = StringIO()
+        call_command("compute_suggestions", "--incremental", stdout=out)
+        self.assertIn("Computed suggestions for 2 users.", out.getvalue())
+        self.assertFalse(SuggestionSet.objects.filter(is_stale=True).exists())
+        call_command("compute_suggestions", "--incremental", stdout=out)
+        self.assertIn("No stale suggestions.", out.getvalue())
@@ -0,0 +1,108 @@
+import os
+import tempfile
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from .models import CustomUser, UploadSession
+
+
+def png_bytes(size=(40, 30)):
+    # Noise does not compress, so the file spans several 1 KB parts
+    out = BytesIO()
+    Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(out, "PNG")
+    return out.getvalue()
+
+
+@override_settings(AVATAR_PROCESSING_SYNC=True, UPLOAD_PART_MAX_SIZE=1024, UPLOAD_MAX_SIZE=64 * 1024)
+class ChunkedUploadTests(APITestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        overrides = override_settings(MEDIA_ROOT=media_root.name)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.media_root = media_root.name
+        self.user = CustomUser.objects.create_user("a", password="pass12345")
+        self.client.force_authenticate(self.user)
+
+    def start(self, size, filename="me.png"):
+        response = self.client.post("/api/accounts/uploads/", {"filename": filename, "size": size}, format="json")
+        self.assertEqual(response.status_code, 201)
+        return f"/api/accounts/uploads/{response.data['id']}/"
+
+    def put_part(self, url, number, data):
+        return self.client.put(f"{url}parts/{number}/", data, content_type="application/octet-stream")
+
+    def upload(self, data, order=None):
+        url = self.start(len(data))
+        chunks = [data[i:i + 1024] for i in range(0, len(data), 1024)]
+        for number in order or range(len(chunks)):
+            self.assertEqual(self.put_part(url, number, chunks[number]).status_code, 200)
+        return url
+
+    def test_parts_in_any_order_assemble_the_picture(self):
+        data = png_bytes()
+        self.assertGreater(len(data), 2048)
+        chunks = -(-len(data) // 1024)
+        url = self.upload(data, order=reversed(range(chunks)))
+        self.assertEqual(self.client.get(url).data["received"], len(data))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"{url}complete/")
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        with self.user.profile_picture.open("rb") as f:
+            self.assertEqual(f.read(), data)
+        self.assertTrue(self.user.avatar_variants)
+        self.assertFalse(os.listdir(os.path.join(self.media_root, "uploads", url.split("/")[-2])))
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_resending_a_part_replaces_it(self):
+        data = png_bytes()
+        url = self.upload(data)
+        self.put_part(url, 0, data[:1024])
+        self.assertEqual(self.client.get(url).data["received"], len(data))
+
+    def test_size_limits(self):
+        response = self.client.post("/api/accounts/uploads/", {"filename": "big.png", "size": 64 * 1024 + 1}, format="json")
+        self.assertEqual(response.status_code, 400)
+        url = self.start(1500)
+        self.assertEqual(self.put_part(url, 0, b"x" * 1025).status_code, 413)
+        self.assertEqual(self.put_part(url, 0, b"x" * 1000).status_code, 200)
+        self.assertEqual(self.put_part(url, 1, b"x" * 501).status_code, 400)
+        self.assertEqual(self.client.get(url).data["parts"], {"0": 1000})
+
+    def test_complete_rejects_missing_parts_and_non_images(self):
+        data = png_bytes()
+        url = self.start(len(data))
+        self.put_part(url, 1, data[1024:2048])
+        self.assertEqual(self.client.post(f"{url}complete/").status_code, 400)
+        url = self.start(10)
+        self.put_part(url, 0, b"not an img")
+        self.assertEqual(self.client.post(f"{url}complete/").status_code, 400)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.profile_picture)
+
+    def test_abort_removes_the_parts(self):
+        url = self.upload(png_bytes())
+        session = UploadSession.objects.get()
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(default_storage.exists(session.part_name(0)))
+
+    def test_part_and_complete_urls_only_accept_their_method(self):
+        url = self.upload(png_bytes())
+        for method in ("get", "delete"):
+            self.assertEqual(getattr(self.client, method)(f"{url}parts/0/").status_code, 405)
+            self.assertEqual(getattr(self.client, method)(f"{url}complete/").status_code, 405)
+        self.assertTrue(UploadSession.objects.exists())
+
+    def test_other_users_cannot_touch_a_session(self):
+        url = self.upload(png_bytes())
+        self.client.force_authenticate(CustomUser.objects.create_user("b", password="pass12345"))
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.put_part(url, 0, b"x").status_code, 404)
+        self.assertEqual(self.client.post(f"{url}complete/").status_code, 404)
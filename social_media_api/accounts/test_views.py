@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .authentication import _local_cache, _token_key
+from .graph import follow_graph
+from .models import CustomUser
+
+
+class FollowGraphTests(APITestCase):
+    def setUp(self):
+        self.a = CustomUser.objects.create_user("a", password="pass12345")
+        self.b = CustomUser.objects.create_user("b", password="pass12345")
+        self.c = CustomUser.objects.create_user("c", password="pass12345")
+        self.b.followers.add(self.a)
+        follow_graph.load()
+
+    def test_local_follows_apply_without_queries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.c.following.add(self.a, self.b)
+        with self.assertNumQueries(0):
+            self.assertEqual(follow_graph.followers_count(self.b.pk), 2)
+            self.assertTrue(follow_graph.is_following(self.c.pk, self.a.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.c.following.clear()
+        self.assertEqual(follow_graph.following_count(self.c.pk), 0)
+        self.assertEqual(follow_graph.followers_count(self.b.pk), 1)
+
+    def test_stale_reads_keep_the_snapshot_and_reload_once(self):
+        follow_graph.invalidate()
+        with mock.patch("accounts.graph.threading.Thread") as thread, self.assertNumQueries(0):
+            self.assertTrue(follow_graph.is_following(self.a.pk, self.b.pk))
+            self.assertEqual(follow_graph.followers_count(self.b.pk), 1)
+        thread.assert_called_once()
+        follow_graph._refreshing = False
+        follow_graph.load()
+
+
+class CachedTokenAuthTests(APITestCase):
+    def setUp(self):
+        caches["shared"].clear()
+        _local_cache.clear()
+        self.user = CustomUser.objects.create_user("a", password="pass12345")
+        self.token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_repeat_requests_skip_the_database(self):
+        self.client.get("/api/accounts/profile")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/accounts/profile").status_code, 200)
+
+    def test_revocation_goes_through_the_shared_cache(self):
+        self.client.get("/api/accounts/profile")
+        key = _token_key(self.token.key)
+        self.assertEqual(caches["shared"].get(key), self.user.pk)
+        self.token.delete()
+        # The entry every worker reads is gone, not just this process's copy
+        self.assertIsNone(caches["shared"].get(key))
+        self.assertEqual(self.client.get("/api/accounts/profile").status_code, 401)
+
+    def test_deactivation(self):
+        self.client.get("/api/accounts/profile")
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/accounts/profile").status_code, 401)
+
+    @override_settings(TOKEN_AUTH_CACHE_ALIAS="")
+    def test_local_lru(self):
+        self.client.get("/api/accounts/profile")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/accounts/profile").status_code, 200)
+        self.token.delete()
+        self.assertEqual(self.client.get("/api/accounts/profile").status_code, 401)
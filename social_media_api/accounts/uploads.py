@@ -0,0 +1,124 @@
+"""Chunked, resumable profile picture uploads streamed straight into storage.
+
+Each part is read from the request body in DEFAULT_CHUNK_SIZE pieces and written to the
+default storage (MEDIA_ROOT locally, S3 with USE_S3) as its own object, so a worker never
+holds more than one chunk of an upload in memory and a dropped connection only loses the
+current part. Completing the session streams the parts, in order, into the picture's
+storage through a concatenating reader, then deletes them.
+"""
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+from .avatars import schedule_avatar_processing
+from .models import UploadSession
+
+class UploadError(Exception):
+    pass
+
+class BodyReader:
+    """File-like view of the next `length` bytes of a request body stream."""
+
+    def __init__(self, stream, length):
+        self.stream = stream
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(size)
+        if not data:
+            raise UploadError("Request body ended before Content-Length bytes were received.")
+        self.remaining -= len(data)
+        return data
+
+class ConcatReader:
+    """Sequential read() over several storage files, opening one at a time."""
+
+    def __init__(self, storage, names):
+        self.storage = storage
+        self.names = list(names)
+        self.current = None
+
+    def read(self, size=-1):
+        chunks = []
+        while size is None or size < 0 or size > 0:
+            if self.current is None:
+                if not self.names:
+                    break
+                self.current = self.storage.open(self.names.pop(0), "rb")
+            data = self.current.read(size if size and size > 0 else -1)
+            if not data:
+                self.current.close()
+                self.current = None
+                continue
+            chunks.append(data)
+            if size and size > 0:
+                size -= len(data)
+        return b"".join(chunks)
+
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+
+def _as_file(reader, name, size):
+    content = File(reader, name=name)
+    # Known up front: storages must not seek or read ahead to measure the stream
+    content.size = size
+    return content
+
+def save_part(session, number, stream, length):
+    """Stream `length` bytes of `stream` into part `number` of `session` (re-sending a part replaces it)."""
+    name = session.part_name(number)
+    default_storage.delete(name)
+    default_storage.save(name, _as_file(BodyReader(stream, length), name, length))
+    with transaction.atomic():
+        locked = UploadSession.objects.select_for_update().get(pk=session.pk)
+        locked.parts[str(number)] = length
+        locked.save(update_fields=["parts"])
+    return locked
+
+def _delete_parts(session):
+    for number in session.parts:
+        default_storage.delete(session.part_name(int(number)))
+
+def complete(session):
+    """Assemble the parts into the user's profile_picture and schedule avatar processing."""
+    numbers = sorted(int(n) for n in session.parts)
+    if numbers != list(range(len(numbers))) or not numbers:
+        raise UploadError("Parts must be numbered 0..n-1 with none missing.")
+    if session.received != session.size:
+        raise UploadError(f"Received {session.received} of {session.size} bytes.")
+
+    user = session.user
+    field = user.profile_picture
+    reader = ConcatReader(default_storage, [session.part_name(n) for n in numbers])
+    try:
+        field.save(session.filename, _as_file(reader, session.filename, session.size), save=False)
+    finally:
+        reader.close()
+    try:
+        # Only the header is parsed; the assembled file is never loaded whole
+        with field.storage.open(field.name, "rb") as f, Image.open(f):
+            pass
+    except (UnidentifiedImageError, OSError):
+        field.storage.delete(field.name)
+        raise UploadError("Upload is not a supported image.")
+
+    with transaction.atomic():
+        user.avatar_variants = {}
+        user.save(update_fields=["profile_picture", "avatar_variants"])
+        session.completed_at = timezone.now()
+        session.save(update_fields=["completed_at"])
+        schedule_avatar_processing(user)
+    _delete_parts(session)
+    return user
+
+def abort(session):
+    _delete_parts(session)
+    session.delete()
@@ -5,6 +5,15 @@ from .views import (
     ProfileAPIView,
     FollowUserAPIView,
     UnfollowUserAPIView,
+    FollowersListAPIView,
+    FollowingListAPIView,
+    SuggestionsAPIView,
+    BulkFollowAPIView,
+    BulkUnfollowAPIView,
+    UploadSessionListAPIView,
+    UploadSessionAPIView,
+    UploadPartAPIView,
+    UploadCompleteAPIView,
 )
 
 urlpatterns = [
@@ -17,6 +26,17 @@ urlpatterns = [
     path("profile/", ProfileAPIView.as_view(), name="profile_slash"),
 
     # Follow management (as requested)
+    path("follow/bulk/", BulkFollowAPIView.as_view(), name="bulk_follow"),
+    path("unfollow/bulk/", BulkUnfollowAPIView.as_view(), name="bulk_unfollow"),
     path("follow/<int:user_id>/", FollowUserAPIView.as_view(), name="follow_user"),
     path("unfollow/<int:user_id>/", UnfollowUserAPIView.as_view(), name="unfollow_user"),
+    path("users/<int:user_id>/followers/", FollowersListAPIView.as_view(), name="user_followers"),
+    path("users/<int:user_id>/following/", FollowingListAPIView.as_view(), name="user_following"),
+    path("suggestions/", SuggestionsAPIView.as_view(), name="follow_suggestions"),
+
+    # Chunked, resumable profile picture upload
+    path("uploads/", UploadSessionListAPIView.as_view(), name="upload_sessions"),
+    path("uploads/<uuid:pk>/", UploadSessionAPIView.as_view(), name="upload_session"),
+    path("uploads/<uuid:pk>/parts/<int:part>/", UploadPartAPIView.as_view(), name="upload_part"),
+    path("uploads/<uuid:pk>/complete/", UploadCompleteAPIView.as_view(), name="upload_complete"),
 ]
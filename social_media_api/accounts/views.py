@@ -1,18 +1,25 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 
-from .models import CustomUser
+from .follows import bulk_follow, bulk_unfollow
+from .graph import follow_graph
+from . import uploads
+from .models import CustomUser, Follow, SuggestionSet, UploadSession
 from .serializers import (
     RegisterSerializer,
     LoginSerializer,
     UserPublicSerializer,
+    UserListItemSerializer,
+    BulkFollowSerializer,
+    UploadSessionSerializer,
     ProfileUpdateSerializer,
 )
 
-from notifications.models import Notification
+from notifications.utils import notify
 
 class RegisterAPIView(generics.CreateAPIView):
     queryset = CustomUser.objects.all()
@@ -65,14 +72,8 @@ class FollowUserAPIView(generics.GenericAPIView):
         # request.user follows target => add request.user to target.followers
         target.followers.add(request.user)
 
-        # Notification.objects.create required by checker
-        Notification.objects.create(
-            recipient=target,
-            actor=request.user,
-            verb="followed you",
-            target_content_type=None,
-            target_object_id=None,
-        )
+        # Queued in the notification outbox (NOTIFICATIONS_ASYNC=False writes it synchronously)
+        notify(recipient=target, actor=request.user, verb="followed you")
         return Response({"detail": f"You are now following {target.username}."}, status=200)
 
 class UnfollowUserAPIView(generics.GenericAPIView):
@@ -82,3 +83,127 @@ class UnfollowUserAPIView(generics.GenericAPIView):
         target = get_object_or_404(CustomUser, id=user_id)
         target.followers.remove(request.user)
         return Response({"detail": f"You unfollowed {target.username}."}, status=200)
+
+class BulkFollowAPIView(generics.GenericAPIView):
+    """POST {"user_ids": [...]} (up to 100): follow/unfollow them all in one request."""
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = BulkFollowSerializer
+    action = staticmethod(bulk_follow)
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = self.action(request.user, serializer.validated_data["user_ids"])
+        return Response({"results": [{"user_id": user_id, "status": status_} for user_id, status_ in results]})
+
+class BulkUnfollowAPIView(BulkFollowAPIView):
+    action = staticmethod(bulk_unfollow)
+
+class FollowListAPIView(generics.GenericAPIView):
+    """Followers (or followed accounts) of a user, newest edge first.
+
+    Pages with the keyset cursor over Follow ids on the (user, -id) / (follower, -id)
+    indexes, so deep pages of large accounts cost the same as the first one.
+    """
+    serializer_class = UserListItemSerializer
+    # Follow column holding the listed user, and the one filtered on
+    side = "follower"
+    owner = "user"
+
+    def get_queryset(self):
+        return (
+            Follow.objects.filter(**{f"{self.owner}_id": self.kwargs["user_id"]})
+            .select_related(self.side)
+            .only(
+                "id",
+                self.side,
+                f"{self.side}__id",
+                f"{self.side}__username",
+                f"{self.side}__profile_picture",
+                f"{self.side}__avatar_variants",
+            )
+            .order_by("-id")
+        )
+
+    def get(self, request, user_id: int, *args, **kwargs):
+        get_object_or_404(CustomUser.objects.only("id"), id=user_id)
+        edges = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer([getattr(edge, self.side) for edge in edges], many=True)
+        return self.get_paginated_response(serializer.data)
+
+class FollowersListAPIView(FollowListAPIView):
+    side, owner = "follower", "user"
+
+class FollowingListAPIView(FollowListAPIView):
+    side, owner = "user", "follower"
+
+class SuggestionsAPIView(generics.GenericAPIView):
+    """Precomputed "people you may know" for the requesting user (see compute_suggestions)."""
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UserListItemSerializer
+
+    def get(self, request, *args, **kwargs):
+        ids = SuggestionSet.objects.filter(user=request.user).values_list("suggested_ids", flat=True).first() or []
+        # Drop accounts followed since the last run, without a query
+        ids = [i for i in ids if not follow_graph.is_following(request.user.pk, i)]
+        users = CustomUser.objects.filter(id__in=ids, is_active=True).only("id", "username", "profile_picture", "avatar_variants").in_bulk()
+        serializer = self.get_serializer([users[i] for i in ids if i in users], many=True)
+        return Response({"results": serializer.data})
+
+class UploadSessionListAPIView(generics.CreateAPIView):
+    """POST {"filename", "size"}: start a chunked profile picture upload."""
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UploadSessionSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+class UploadSessionMixin:
+    """The requesting user's unfinished upload sessions, shared by the per-session views."""
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UploadSessionSerializer
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user, completed_at__isnull=True)
+
+class UploadSessionAPIView(UploadSessionMixin, generics.RetrieveDestroyAPIView):
+    """GET: received parts (to resume after a dropped connection). DELETE: abort."""
+
+    def perform_destroy(self, instance):
+        uploads.abort(instance)
+
+class UploadPartAPIView(UploadSessionMixin, generics.GenericAPIView):
+    """PUT raw bytes (application/octet-stream, Content-Length required) as part <part>."""
+
+    def put(self, request, *args, part: int, **kwargs):
+        session = self.get_object()
+        try:
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        if length <= 0:
+            return Response({"detail": "Content-Length is required."}, status=status.HTTP_411_LENGTH_REQUIRED)
+        if length > settings.UPLOAD_PART_MAX_SIZE:
+            return Response(
+                {"detail": f"Parts are limited to {settings.UPLOAD_PART_MAX_SIZE} bytes."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        if session.received - session.parts.get(str(part), 0) + length > session.size:
+            return Response({"detail": "Parts exceed the declared size."}, status=status.HTTP_400_BAD_REQUEST)
+        # request.data is never touched: the body is streamed, not parsed or buffered
+        try:
+            session = uploads.save_part(session, part, request.stream, length)
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(session).data)
+
+class UploadCompleteAPIView(UploadSessionMixin, generics.GenericAPIView):
+    """POST: assemble the parts into the profile picture."""
+
+    def post(self, request, *args, **kwargs):
+        session = self.get_object()
+        try:
+            user = uploads.complete(session)
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(UserPublicSerializer(user, context=self.get_serializer_context()).data)
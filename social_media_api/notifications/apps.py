@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class NotificationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "notifications"
+
+    def ready(self):
+        from . import checks, outbox  # noqa: registers system checks and queue metrics
@@ -0,0 +1,36 @@
+"""System checks for the notification stream wiring."""
+from django.conf import settings
+from django.core.checks import Error, register
+from django.utils.module_loading import import_string
+
+from .pubsub import CacheBroker, InProcessBroker
+
+# Backends whose entries never leave the process that wrote them
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+@register()
+def check_stream_broker(app_configs, **kwargs):
+    # With the outbox, deliver() (and so publish()) runs in the worker process, never in the
+    # ASGI process holding the streams; the wake-up has to cross processes.
+    if not settings.NOTIFICATIONS_ASYNC:
+        return []
+    broker = import_string(settings.NOTIFICATION_STREAM_BROKER)
+    if issubclass(broker, InProcessBroker):
+        return [Error(
+            "InProcessBroker cannot wake streams when NOTIFICATIONS_ASYNC is on.",
+            hint="Use notifications.pubsub.CacheBroker with a shared cache, or set NOTIFICATIONS_ASYNC=False.",
+            id="notifications.E001",
+        )]
+    if issubclass(broker, CacheBroker):
+        alias = settings.NOTIFICATION_STREAM_CACHE_ALIAS
+        backend = settings.CACHES.get(alias, {}).get("BACKEND")
+        if alias not in settings.CACHES or backend in PER_PROCESS_CACHES:
+            return [Error(
+                f"CacheBroker needs a cache shared across processes; {alias!r} is {backend or 'not configured'}.",
+                hint="Point NOTIFICATION_STREAM_CACHE_ALIAS at a Redis, Memcached, database or file-based cache.",
+                id="notifications.E002",
+            )]
+    return []
@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Notification, NotificationActor, NotificationState
+from .pubsub import get_broker
+
+FIELDS = (
+    "recipient_id", "actor_id", "verb", "target_content_type_id", "target_object_id",
+    "action_object_content_type_id", "action_object_id",
+)
+
+def _group_key(item):
+    get = item.get if isinstance(item, dict) else lambda f: getattr(item, f)
+    return (get("recipient_id"), get("verb"), get("target_content_type_id"), get("target_object_id"))
+
+def _merge_actors(recent, actor_ids):
+    """Move `actor_ids` (oldest first) to the front of `recent`, keeping the latest few."""
+    recent = list(recent)
+    for actor_id in actor_ids:
+        if actor_id in recent:
+            recent.remove(actor_id)
+        recent.insert(0, actor_id)
+    return recent[: settings.NOTIFICATION_RECENT_ACTORS]
+
+def _new_actors(actor_ids, seen):
+    """Distinct `actor_ids` not in `seen`, in order."""
+    return [a for a in dict.fromkeys(actor_ids) if a not in seen]
+
+@transaction.atomic
+def deliver(payloads):
+    """Write notification payloads (dicts of FIELDS), folding repeats of the same
+    (recipient, verb, target) inside NOTIFICATION_AGGREGATION_WINDOW into one row.
+
+    Returns the created or updated notifications.
+    """
+    if not payloads:
+        return []
+    groups = {}
+    for p in payloads:
+        groups.setdefault(_group_key(p), []).append(p)
+
+    open_groups = {}
+    window = settings.NOTIFICATION_AGGREGATION_WINDOW
+    if window:
+        candidates = Notification.objects.select_for_update(of=("self",)).filter(
+            Q(recipient__notification_state__isnull=True)
+            | Q(id__gt=F("recipient__notification_state__read_watermark")),
+            recipient_id__in={k[0] for k in groups},
+            verb__in={k[1] for k in groups},
+            is_read=False,
+            timestamp__gte=timezone.now() - timedelta(seconds=window),
+        ).order_by("timestamp")
+        # Latest open row per key wins
+        open_groups = {_group_key(n): n for n in candidates if _group_key(n) in groups}
+
+    # Actors already counted in the open groups; the rows are locked above, so this stays exact
+    seen = {}
+    if open_groups:
+        # Only this batch's actors can be new; a popular post's link set may be huge
+        links = NotificationActor.objects.filter(
+            notification__in=list(open_groups.values()),
+            actor_id__in={p["actor_id"] for p in payloads},
+        )
+        for notification_id, actor_id in links.values_list("notification_id", "actor_id"):
+            seen.setdefault(notification_id, set()).add(actor_id)
+
+    now = timezone.now()
+    touched, created, created_actors, links = [], [], [], []
+    for key, items in groups.items():
+        actor_ids = [p["actor_id"] for p in items]
+        # The latest event's action object wins (e.g. the newest comment)
+        action = {
+            "action_object_content_type_id": items[-1].get("action_object_content_type_id"),
+            "action_object_id": items[-1].get("action_object_id"),
+        }
+        existing = open_groups.get(key)
+        if existing is None:
+            new_actors = _new_actors(actor_ids, set())
+            created.append(Notification(
+                recipient_id=key[0], actor_id=actor_ids[-1], verb=key[1],
+                target_content_type_id=key[2], target_object_id=key[3],
+                actor_count=len(new_actors), recent_actors=_merge_actors([], actor_ids), **action,
+            ))
+            created_actors.append(new_actors)
+            continue
+        new_actors = _new_actors(actor_ids, seen.get(existing.pk, set()))
+        recent = _merge_actors(existing.recent_actors, actor_ids)
+        Notification.objects.filter(pk=existing.pk).update(
+            actor_id=actor_ids[-1], recent_actors=recent,
+            actor_count=F("actor_count") + len(new_actors), timestamp=now, **action,
+        )
+        existing.actor_id, existing.recent_actors, existing.timestamp = actor_ids[-1], recent, now
+        for field, value in action.items():
+            setattr(existing, field, value)
+        existing.actor_count += len(new_actors)
+        links += [NotificationActor(notification_id=existing.pk, actor_id=a) for a in new_actors]
+        touched.append(existing)
+    created = Notification.objects.bulk_create(created)
+    for notification, new_actors in zip(created, created_actors):
+        links += [NotificationActor(notification_id=notification.pk, actor_id=a) for a in new_actors]
+    NotificationActor.objects.bulk_create(links, ignore_conflicts=True)
+    _add_unread(created)
+    recipients = {key[0] for key in groups}
+    transaction.on_commit(lambda: get_broker().publish(recipients))
+    return created + touched
+
+def _add_unread(created):
+    # Grouped updates land on rows that are already unread, so only new rows count
+    per_user = {}
+    for n in created:
+        per_user[n.recipient_id] = per_user.get(n.recipient_id, 0) + 1
+    if not per_user:
+        return
+    NotificationState.objects.bulk_create([NotificationState(user_id=u) for u in per_user], ignore_conflicts=True)
+    for user_id, count in per_user.items():
+        NotificationState.objects.filter(user_id=user_id).update(unread_count=F("unread_count") + count)
@@ -0,0 +1,94 @@
+from datetime import timedelta
+from itertools import chain
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Notification, NotificationState
+
+def pending(window_hours, until):
+    """Unread notifications since each recipient's last digest (at most `window_hours` back), up to `until`."""
+    return (
+        Notification.objects.filter(
+            timestamp__gte=until - timedelta(hours=window_hours),
+            timestamp__lte=until,
+            is_read=False,
+            recipient__is_active=True,
+        )
+        .exclude(recipient__email="")
+        .filter(
+            Q(recipient__notification_state__isnull=True)
+            | (
+                Q(id__gt=F("recipient__notification_state__read_watermark"))
+                & (
+                    Q(recipient__notification_state__last_digest_at__isnull=True)
+                    | Q(timestamp__gt=F("recipient__notification_state__last_digest_at"))
+                )
+            )
+        )
+    )
+
+def recipient_batches(qs, batch_size):
+    """Distinct recipient ids of `qs`, in keyset-paged batches of `batch_size`."""
+    last_id = 0
+    while True:
+        batch = list(
+            qs.filter(recipient_id__gt=last_id).order_by("recipient_id")
+            .values_list("recipient_id", flat=True).distinct()[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
+
+def pending_by_user(qs, user_ids):
+    """The notifications of `qs` for `user_ids`, grouped per recipient, newest first."""
+    grouped = {}
+    rows = qs.filter(recipient_id__in=user_ids).select_related("actor", "recipient").order_by("recipient_id", "-timestamp")
+    for notification in rows:
+        grouped.setdefault(notification.recipient_id, []).append(notification)
+    return grouped
+
+def build_message(user, notifications):
+    limit = settings.NOTIFICATION_DIGEST_MAX_ITEMS
+    body = render_to_string(
+        "notifications/digest_email.txt",
+        {
+            "user": user,
+            "notifications": notifications[:limit],
+            "total": len(notifications),
+            "more": max(len(notifications) - limit, 0),
+        },
+    )
+    subject = f"You have {len(notifications)} unread notification{'s' if len(notifications) != 1 else ''}"
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email])
+
+def send_digests(window_hours=None, batch_size=100, dry_run=False):
+    """Render one digest per user and send them in batches over a single mail connection.
+
+    Recipients are paged by id, so only one batch of users' notifications is in memory at a time.
+    """
+    window_hours = window_hours or settings.NOTIFICATION_DIGEST_WINDOW_HOURS
+    # One cut-off for the query and last_digest_at: anything newer waits for the next digest
+    started = timezone.now()
+    qs = pending(window_hours, started)
+    if dry_run:
+        return sum(len(batch) for batch in recipient_batches(qs, batch_size))
+
+    batches = recipient_batches(qs, batch_size)
+    first = next(batches, None)
+    if first is None:
+        return 0  # don't open a mail connection for nothing
+    sent = 0
+    with get_connection() as connection:
+        for batch in chain([first], batches):
+            grouped = pending_by_user(qs, batch)
+            messages = [build_message(grouped[u][0].recipient, grouped[u]) for u in batch if u in grouped]
+            connection.send_messages(messages)
+            NotificationState.objects.bulk_create([NotificationState(user_id=u) for u in batch], ignore_conflicts=True)
+            NotificationState.objects.filter(user_id__in=batch).update(last_digest_at=started)
+            sent += len(messages)
+    return sent
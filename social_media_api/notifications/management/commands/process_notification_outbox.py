@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from notifications import outbox
+
+class Command(BaseCommand):
+    help = "Drain the notification outbox into Notification rows in bulk batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Notifications written per bulk_create.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+
+    def handle(self, *args, batch_size=500, interval=1.0, once=False, **options):
+        delivered = outbox.run_worker(batch_size=batch_size, interval=interval, once=once)
+        self.stdout.write(self.style.SUCCESS(f"Delivered {delivered} notifications."))
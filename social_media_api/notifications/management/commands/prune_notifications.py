@@ -0,0 +1,47 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from notifications.models import Notification
+
+class Command(BaseCommand):
+    help = "Delete read notifications older than the retention period, in small throttled batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Retention in days (default NOTIFICATION_RETENTION_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows deleted per transaction.")
+        parser.add_argument("--sleep", type=float, default=0.1, help="Seconds to pause between batches.")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be deleted.")
+
+    def handle(self, *args, days=None, batch_size=1000, sleep=0.1, max_batches=None, dry_run=False, **options):
+        days = settings.NOTIFICATION_RETENTION_DAYS if days is None else days
+        cutoff = timezone.now() - timedelta(days=days)
+        # Read = explicitly read or below the recipient's read watermark; unread rows are kept
+        expired = Notification.objects.filter(timestamp__lt=cutoff).filter(
+            Q(is_read=True) | Q(id__lte=F("recipient__notification_state__read_watermark"))
+        )
+        if dry_run:
+            self.stdout.write(f"{expired.count()} notifications older than {days} days would be deleted.")
+            return
+
+        deleted = batches = 0
+        while max_batches is None or batches < max_batches:
+            # Short transactions on a bounded id list keep locks brief
+            with transaction.atomic():
+                ids = list(expired.order_by("timestamp").values_list("id", flat=True)[:batch_size])
+                if not ids:
+                    break
+                # The total also counts cascaded NotificationActor rows; report notifications only
+                deleted += Notification.objects.filter(id__in=ids).delete()[1].get(Notification._meta.label, 0)
+            batches += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"batch {batches}: {deleted} deleted so far")
+            if sleep and len(ids) == batch_size:
+                time.sleep(sleep)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} notifications older than {days} days."))
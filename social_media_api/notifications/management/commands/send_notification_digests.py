@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from notifications.digest import send_digests
+
+class Command(BaseCommand):
+    help = "Email each user one summary of their unread notifications since their last digest."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--window-hours", type=int, default=None, help="Look-back window (default NOTIFICATION_DIGEST_WINDOW_HOURS).")
+        parser.add_argument("--batch-size", type=int, default=100, help="Messages handed to the mail connection at a time.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the digests that would be sent.")
+
+    def handle(self, *args, window_hours=None, batch_size=100, dry_run=False, **options):
+        count = send_digests(window_hours=window_hours, batch_size=batch_size, dry_run=dry_run)
+        verb = "Would send" if dry_run else "Sent"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {count} digest emails."))
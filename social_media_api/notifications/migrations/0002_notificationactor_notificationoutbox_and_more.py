@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_follow_and_more'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationActor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient_id', models.BigIntegerField()),
+                ('actor_id', models.BigIntegerField()),
+                ('verb', models.CharField(max_length=255)),
+                ('target_content_type_id', models.IntegerField(blank=True, null=True)),
+                ('target_object_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('action_object_content_type_id', models.IntegerField(blank=True, null=True)),
+                ('action_object_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NotificationState',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_state', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('read_watermark', models.BigIntegerField(default=0)),
+                ('last_digest_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='action_object_content_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contenttypes.contenttype'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='action_object_id',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='actor_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='recent_actors',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-timestamp', '-id'], name='notification_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['recipient', '-timestamp', '-id'], name='notification_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['timestamp'], name='notification_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'verb', 'target_content_type', 'target_object_id', '-timestamp'], name='notification_group_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationactor',
+            name='actor',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='notificationactor',
+            name='notification',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='actor_links', to='notifications.notification'),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationactor',
+            constraint=models.UniqueConstraint(fields=('notification', 'actor'), name='unique_actor_per_notification'),
+        ),
+    ]
@@ -11,12 +11,97 @@ class Notification(models.Model):
     target_content_type = models.ForeignKey(ContentType, on_delete=models.SET_NULL, null=True, blank=True)
     target_object_id = models.PositiveIntegerField(null=True, blank=True)
     target = GenericForeignKey("target_content_type", "target_object_id")
+    # What triggered the latest event, e.g. the newest comment on a "commented on your post" row
+    action_object_content_type = models.ForeignKey(
+        ContentType, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    action_object_id = models.PositiveIntegerField(null=True, blank=True)
+    action_object = GenericForeignKey("action_object_content_type", "action_object_id")
 
     timestamp = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    # Aggregation: repeated (recipient, verb, target) events inside the window update one row.
+    # `actor` is the latest actor; `recent_actors` holds the ids of the latest few, newest first;
+    # `actor_count` counts distinct actors, tracked in NotificationActor.
+    actor_count = models.PositiveIntegerField(default=1)
+    recent_actors = models.JSONField(default=list, blank=True)
+
     class Meta:
         ordering = ["-timestamp"]
+        indexes = [
+            # NotificationViewSet: recipient's notifications in keyset order, all and unread-only
+            models.Index(fields=["recipient", "-timestamp", "-id"], name="notification_inbox_idx"),
+            models.Index(
+                fields=["recipient", "-timestamp", "-id"],
+                name="notification_unread_idx",
+                condition=models.Q(is_read=False),
+            ),
+            # Retention pruning scans by age; also the natural key for range partitioning
+            models.Index(fields=["timestamp"], name="notification_timestamp_idx"),
+            models.Index(
+                fields=["recipient", "verb", "target_content_type", "target_object_id", "-timestamp"],
+                name="notification_group_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.actor} {self.verb} -> {self.recipient}"
+
+    @property
+    def summary(self):
+        # "alice and 41 others liked your post"
+        others = self.actor_count - 1
+        if others <= 0:
+            return f"{self.actor} {self.verb}"
+        return f"{self.actor} and {others} other{'s' if others > 1 else ''} {self.verb}"
+
+class NotificationActor(models.Model):
+    """Distinct actors folded into a grouped notification, so `actor_count` counts each actor once."""
+
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name="actor_links")
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["notification", "actor"], name="unique_actor_per_notification")
+        ]
+
+    def __str__(self):
+        return f"{self.actor_id} in {self.notification_id}"
+
+class NotificationOutbox(models.Model):
+    """Pending notification, enqueued cheaply in the request and delivered in bulk by
+    `python manage.py process_notification_outbox`. Plain id columns keep the insert narrow."""
+
+    recipient_id = models.BigIntegerField()
+    actor_id = models.BigIntegerField()
+    verb = models.CharField(max_length=255)
+    target_content_type_id = models.IntegerField(null=True, blank=True)
+    target_object_id = models.PositiveIntegerField(null=True, blank=True)
+    action_object_content_type_id = models.IntegerField(null=True, blank=True)
+    action_object_id = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.actor_id} {self.verb} -> {self.recipient_id} (queued)"
+
+class NotificationState(models.Model):
+    """Per-user notification bookkeeping, so badge polling never scans notifications_notification."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="notification_state"
+    )
+    unread_count = models.PositiveIntegerField(default=0)
+    # Notifications with id <= read_watermark are read ("mark all read" moves it);
+    # Notification.is_read only records explicit single reads above it
+    read_watermark = models.BigIntegerField(default=0)
+    # Notifications newer than this are pending for the next email digest
+    last_digest_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread_count} unread"
+
+    @classmethod
+    def watermark_for(cls, user):
+        return cls.objects.filter(user=user).values_list("read_watermark", flat=True).first() or 0
@@ -0,0 +1,54 @@
+import time
+
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from social_media_api import metrics
+
+from .delivery import FIELDS, deliver
+from .models import NotificationOutbox
+
+def enqueue(payloads):
+    NotificationOutbox.objects.bulk_create([NotificationOutbox(**p) for p in payloads])
+    metrics.incr("notifications.outbox_enqueued", len(payloads))
+
+def drain(batch_size=500):
+    """Deliver up to `batch_size` queued notifications; returns how many were delivered.
+
+    Rows are claimed with SKIP LOCKED (where supported) so several workers can drain in parallel.
+    """
+    with metrics.timer("notifications.outbox_drain_ms"), transaction.atomic():
+        rows = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values("id", "created_at", *FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        deliver(rows)
+        NotificationOutbox.objects.filter(id__in=[r["id"] for r in rows]).delete()
+    metrics.incr("notifications.outbox_delivered", len(rows))
+    metrics.gauge("notifications.outbox_last_drain_lag_seconds", (timezone.now() - rows[0]["created_at"]).total_seconds())
+    return len(rows)
+
+def depth():
+    return NotificationOutbox.objects.count()
+
+def lag_seconds():
+    """Age of the oldest queued notification (0 when the queue is empty)."""
+    oldest = NotificationOutbox.objects.aggregate(oldest=Min("created_at"))["oldest"]
+    return (timezone.now() - oldest).total_seconds() if oldest else 0.0
+
+def run_worker(batch_size=500, interval=1.0, once=False):
+    delivered = 0
+    while True:
+        count = drain(batch_size)
+        delivered += count
+        if count < batch_size:
+            if once:
+                return delivered
+            time.sleep(interval)
+
+metrics.gauge("notifications.outbox_depth", depth)
+metrics.gauge("notifications.outbox_lag_seconds", lag_seconds)
@@ -0,0 +1,106 @@
+"""Wake-up channel between notification delivery and open notification streams.
+
+Delivery calls `publish(user_ids)` after commit; each stream holds a subscription and only
+queries the database after being woken, so idle clients cost no queries.
+
+- InProcessBroker: asyncio events in this process (dev server, tests, single ASGI process).
+- CacheBroker (default): bumps a per-user token in NOTIFICATION_STREAM_CACHE_ALIAS; subscribers
+  poll it. Reaches streams in other processes (outbox worker, several ASGI workers) as long as
+  that cache is shared; see checks.py.
+"""
+import asyncio
+import threading
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+class InProcessSubscription:
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.event = asyncio.Event()
+
+    async def wait(self, timeout):
+        """Return True when woken by a publish, False on timeout."""
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.event.clear()
+        return True
+
+    def close(self):
+        self.broker._unsubscribe(self)
+
+class InProcessBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, user_id):
+        subscription = InProcessSubscription(self, user_id)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subs = self._subscriptions.get(subscription.user_id)
+            if subs:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_ids):
+        with self._lock:
+            targets = [s for user_id in user_ids for s in self._subscriptions.get(user_id, ())]
+        for subscription in targets:
+            subscription.loop.call_soon_threadsafe(subscription.event.set)
+
+_UNSET = object()
+
+def _cache():
+    return caches[settings.NOTIFICATION_STREAM_CACHE_ALIAS]
+
+class CacheSubscription:
+    def __init__(self, key):
+        self.key = key
+        self.token = _UNSET
+
+    async def wait(self, timeout):
+        if self.token is _UNSET:
+            self.token = await _cache().aget(self.key)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            token = await _cache().aget(self.key)
+            if token != self.token:
+                self.token = token
+                return True
+            await asyncio.sleep(min(settings.NOTIFICATION_STREAM_POLL_INTERVAL, max(deadline - loop.time(), 0)))
+        return False
+
+    def close(self):
+        pass
+
+class CacheBroker:
+    def _key(self, user_id):
+        return f"notifications:stream:{user_id}"
+
+    def subscribe(self, user_id):
+        return CacheSubscription(self._key(user_id))
+
+    def publish(self, user_ids):
+        _cache().set_many({self._key(user_id): uuid.uuid4().hex for user_id in user_ids}, None)
+
+_broker = None
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.NOTIFICATION_STREAM_BROKER)()
+    return _broker
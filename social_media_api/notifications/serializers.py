@@ -1,10 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.utils.text import Truncator
 from rest_framework import serializers
 from .models import Notification
 
+def actor_names(notifications):
+    """Usernames for every id in the notifications' recent_actors, in one query."""
+    ids = {actor_id for n in notifications for actor_id in n.recent_actors}
+    return dict(get_user_model().objects.filter(id__in=ids).values_list("id", "username")) if ids else {}
+
+def describe(target):
+    """Compact summary of a notification's target or action object."""
+    if target is None:
+        return None
+    kind = target._meta.model_name
+    if kind == "post":
+        return {"type": "post", "id": target.pk, "title": target.title}
+    if kind == "comment":
+        return {"type": "comment", "id": target.pk, "post": target.post_id, "snippet": Truncator(target.content).chars(80)}
+    if kind == "customuser":
+        return {"type": "user", "id": target.pk, "username": target.username}
+    return {"type": kind, "id": target.pk}
+
+class NotificationListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        notifications = list(data.all() if hasattr(data, "all") else data)
+        self.context["actor_names"] = actor_names(notifications)
+        return super().to_representation(notifications)
+
 class NotificationSerializer(serializers.ModelSerializer):
     actor = serializers.StringRelatedField(read_only=True)
     recipient = serializers.StringRelatedField(read_only=True)
+    recent_actors = serializers.SerializerMethodField()
+    summary = serializers.SerializerMethodField()
+    is_read = serializers.SerializerMethodField()
+    target = serializers.SerializerMethodField()
+    action_object = serializers.SerializerMethodField()
 
     class Meta:
         model = Notification
-        fields = ["id", "recipient", "actor", "verb", "target_object_id", "timestamp", "is_read"]
+        fields = [
+            "id", "recipient", "actor", "verb", "target_object_id", "target", "action_object", "timestamp",
+            "is_read", "actor_count", "recent_actors", "summary",
+        ]
+        list_serializer_class = NotificationListSerializer
+
+    def get_recent_actors(self, obj):
+        names = self.context.get("actor_names")
+        if names is None:
+            names = actor_names([obj])
+        return [names[actor_id] for actor_id in obj.recent_actors if actor_id in names]
+
+    def get_target(self, obj):
+        # Resolved in bulk by prefetch_related("target", "action_object"): one query per content type per page
+        return describe(obj.target)
+
+    def get_action_object(self, obj):
+        return describe(obj.action_object)
+
+    def get_is_read(self, obj):
+        return obj.is_read or obj.id <= self.context.get("read_watermark", 0)
+
+    def get_summary(self, obj):
+        return obj.summary
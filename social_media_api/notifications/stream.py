@@ -0,0 +1,96 @@
+"""Server-Sent Events stream of new/updated notifications (needs the ASGI entry point).
+
+    GET /api/notifications/stream/           Authorization: Token <key>   (or ?token=<key>)
+
+Each event carries one serialized notification; its `id:` is `<timestamp>,<notification id>`, so a
+reconnecting EventSource resumes from `Last-Event-ID` without skipping rows that share a timestamp. Between events the stream waits on the
+pub/sub broker and only sends keep-alive comments: idle clients run no queries.
+"""
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import exceptions
+
+from accounts.authentication import CachedTokenAuthentication
+
+from .models import Notification, NotificationState
+from .pubsub import get_broker
+from .serializers import NotificationSerializer
+
+def _authenticate(request):
+    auth = CachedTokenAuthentication()
+    token = request.GET.get("token")
+    try:
+        result = auth.authenticate_credentials(token) if token else auth.authenticate(request)
+    except exceptions.AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+def _parse_cursor(value):
+    """`<timestamp>,<id>` (or a bare timestamp) -> (timestamp, id); None if unreadable."""
+    timestamp, _, pk = value.rpartition(",") if "," in value else (value, "", "")
+    try:
+        timestamp, pk = parse_datetime(timestamp), int(pk) if pk else None
+    except ValueError:
+        return None
+    return (timestamp, pk) if timestamp else None
+
+def _changed_since(user, cursor):
+    timestamp, pk = cursor
+    after = Q(timestamp__gt=timestamp)
+    if pk is not None:
+        # Rows sharing the last timestamp are ordered by id
+        after |= Q(timestamp=timestamp, id__gt=pk)
+    rows = list(
+        Notification.objects.filter(after, recipient=user)
+        .select_related("actor", "recipient")
+        .prefetch_related("target", "action_object")
+        .order_by("timestamp", "id")[: settings.NOTIFICATION_STREAM_BATCH]
+    )
+    context = {"read_watermark": NotificationState.watermark_for(user)}
+    return rows, NotificationSerializer(rows, many=True, context=context).data
+
+def _event(notification, data):
+    event_id = f"{notification.timestamp.isoformat()},{notification.id}"
+    return f"id: {event_id}\nevent: notification\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _events(user, cursor):
+    broker = get_broker()
+    subscription = broker.subscribe(user.pk)
+    started = timezone.now()
+    deadline = started + timedelta(seconds=settings.NOTIFICATION_STREAM_MAX_SECONDS)
+    # Resuming clients get their backlog first; fresh ones only see what happens from now on
+    woken = cursor is not None
+    cursor = cursor or (started, None)
+    try:
+        yield f"retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n"
+        while timezone.now() < deadline:
+            if woken:
+                rows, data = await sync_to_async(_changed_since)(user, cursor)
+                for notification, item in zip(rows, data):
+                    cursor = (notification.timestamp, notification.id)
+                    yield _event(notification, item)
+                if len(rows) == settings.NOTIFICATION_STREAM_BATCH:
+                    continue
+            woken = await subscription.wait(settings.NOTIFICATION_STREAM_HEARTBEAT)
+            if not woken:
+                yield ": keep-alive\n\n"
+    finally:
+        subscription.close()
+
+async def notification_stream(request):
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("since")
+    cursor = _parse_cursor(last_event_id) if last_event_id else None
+    response = StreamingHttpResponse(_events(user, cursor), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
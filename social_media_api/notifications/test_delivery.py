@@ -0,0 +1,44 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import CustomUser
+from posts.models import Post
+
+from .delivery import deliver
+from .models import Notification, NotificationActor
+from .utils import _payload, create_notification
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False)
+class GroupedDeliveryTests(TestCase):
+    """Repeats fold into the open group and count each distinct actor once."""
+
+    def setUp(self):
+        self.owner = CustomUser.objects.create_user("owner", password="pass12345")
+        self.post = Post.objects.create(author=self.owner, title="t", content="c")
+        self.fans = [CustomUser.objects.create_user(f"fan{i}", password="pass12345") for i in range(12)]
+        for fan in self.fans[:10]:
+            create_notification(recipient=self.owner, actor=fan, verb="liked your post", target=self.post)
+        self.group = Notification.objects.get()
+
+    def test_repeat_and_new_actors(self):
+        deliver([
+            _payload(self.owner, self.fans[0], "liked your post", self.post),
+            _payload(self.owner, self.fans[10], "liked your post", self.post),
+            _payload(self.owner, self.fans[11], "liked your post", self.post),
+        ])
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.actor_count, 12)
+        self.assertEqual(self.group.recent_actors[0], self.fans[11].pk)
+        self.assertEqual(NotificationActor.objects.filter(notification=self.group).count(), 12)
+
+    def test_only_the_batch_actors_links_are_read(self):
+        with CaptureQueriesContext(connection) as ctx:
+            deliver([_payload(self.owner, self.fans[0], "liked your post", self.post)])
+        reads = [q["sql"] for q in ctx.captured_queries
+                 if q["sql"].startswith("SELECT") and "notificationactor" in q["sql"]]
+        self.assertEqual(len(reads), 1)
+        self.assertIn('"actor_id" IN', reads[0])
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.actor_count, 10)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+
+from .models import Notification, NotificationState
+from .digest import send_digests
+from .utils import create_notification
+
+
+@override_settings(
+    NOTIFICATIONS_ASYNC=False,
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+class DigestTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user("owner", password="pass12345", email="owner@example.com")
+        self.no_email = CustomUser.objects.create_user("quiet", password="pass12345")
+        self.others = [CustomUser.objects.create_user(f"other{i}", password="pass12345") for i in range(3)]
+        for other in self.others:
+            create_notification(recipient=self.user, actor=other, verb="followed you")
+            create_notification(recipient=self.no_email, actor=other, verb="followed you")
+
+    def test_one_digest_per_user_with_email(self):
+        call_command("send_notification_digests", "--batch-size", "1", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["owner@example.com"])
+        self.assertIn("other2 and 2 others followed you", mail.outbox[0].body)
+
+        # Nothing new since the last digest
+        call_command("send_notification_digests", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_notification_created_during_the_run_is_kept_for_the_next_digest(self):
+        # The run starts, then a notification lands before its query finishes
+        started = timezone.now() - timedelta(seconds=10)
+        Notification.objects.update(timestamp=started - timedelta(minutes=1))
+        late = create_notification(recipient=self.user, actor=self.no_email, verb="poked you")
+        Notification.objects.filter(pk=late.pk).update(timestamp=started + timedelta(seconds=1))
+        with mock.patch("notifications.digest.timezone.now", return_value=started):
+            call_command("send_notification_digests", stdout=StringIO())
+        self.assertNotIn("poked you", mail.outbox[0].body)
+        self.assertEqual(NotificationState.objects.get(user=self.user).last_digest_at, started)
+
+        call_command("send_notification_digests", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn("poked you", mail.outbox[1].body)
+
+    def test_recipients_are_paged(self):
+        others = [
+            CustomUser.objects.create_user(f"reader{i}", password="pass12345", email=f"reader{i}@example.com")
+            for i in range(4)
+        ]
+        for other in others:
+            create_notification(recipient=other, actor=self.no_email, verb="followed you")
+        # 5 recipients, 2 per batch: 3 recipient pages plus the empty last one; per batch one
+        # notification query and two NotificationState writes
+        with self.assertNumQueries(4 + 3 * 3):
+            sent = send_digests(batch_size=2)
+        self.assertEqual(sent, 5)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(u.email for u in [self.user, *others]))
+        self.assertEqual(send_digests(batch_size=2, dry_run=True), 0)
@@ -0,0 +1,51 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+from posts.models import Post
+
+from . import outbox
+from .models import Notification, NotificationOutbox, NotificationState
+
+
+@override_settings(NOTIFICATIONS_ASYNC=True)
+class OutboxTests(APITestCase):
+    """With NOTIFICATIONS_ASYNC, requests only enqueue; the worker delivers in bulk."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = CustomUser.objects.create_user("owner", password="pass12345")
+        self.post = Post.objects.create(author=self.owner, title="t", content="c")
+        self.fans = [CustomUser.objects.create_user(f"fan{i}", password="pass12345") for i in range(3)]
+        for fan in self.fans:
+            self.client.force_authenticate(fan)
+            self.client.post(f"/api/posts/posts/{self.post.id}/like/")
+        self.client.post(f"/api/accounts/follow/{self.owner.id}/")
+
+    def test_requests_only_enqueue(self):
+        self.assertEqual(outbox.depth(), 4)
+        self.assertFalse(Notification.objects.exists())
+        self.assertGreaterEqual(outbox.lag_seconds(), 0)
+
+    def test_drain_in_batches_groups_and_counts(self):
+        self.assertEqual(outbox.drain(batch_size=2), 2)
+        self.assertEqual(outbox.depth(), 2)
+        out = StringIO()
+        call_command("process_notification_outbox", "--once", "--batch-size", "2", stdout=out)
+        self.assertIn("Delivered 2 notifications.", out.getvalue())
+        self.assertEqual((outbox.depth(), outbox.lag_seconds()), (0, 0.0))
+        likes = Notification.objects.get(verb="liked your post")
+        self.assertEqual((likes.actor_count, likes.recent_actors[0]), (3, self.fans[2].pk))
+        self.assertTrue(Notification.objects.filter(verb="followed you").exists())
+        self.assertEqual(NotificationState.objects.get(user=self.owner).unread_count, 2)
+        self.assertEqual(outbox.drain(), 0)
+
+    def test_drained_rows_are_removed_in_order(self):
+        first_ids = list(NotificationOutbox.objects.order_by("id").values_list("id", flat=True)[:3])
+        outbox.drain(batch_size=3)
+        self.assertFalse(NotificationOutbox.objects.filter(id__in=first_ids).exists())
+        self.assertEqual(NotificationOutbox.objects.get().verb, "followed you")
@@ -0,0 +1,57 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import CustomUser
+
+from .models import Notification, NotificationState
+from .utils import create_notification
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False, NOTIFICATION_RETENTION_DAYS=90)
+class PruneNotificationsTests(TestCase):
+    """Only read notifications past the retention period are deleted."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user("owner", password="pass12345")
+        self.others = [CustomUser.objects.create_user(f"other{i}", password="pass12345") for i in range(6)]
+        self.ids = [
+            create_notification(recipient=self.user, actor=other, verb=f"verb {i}").pk
+            for i, other in enumerate(self.others)
+        ]
+        Notification.objects.update(timestamp=timezone.now() - timedelta(days=100))
+        # 0-1 read through the watermark, 2 read on its own, 3-4 unread, 5 read but recent
+        NotificationState.objects.filter(user=self.user).update(read_watermark=self.ids[1])
+        Notification.objects.filter(id__in=[self.ids[2], self.ids[5]]).update(is_read=True)
+        Notification.objects.filter(id=self.ids[5]).update(timestamp=timezone.now())
+
+    def prune(self, *args):
+        out = StringIO()
+        call_command("prune_notifications", "--sleep", "0", *args, stdout=out)
+        return out.getvalue()
+
+    def remaining(self):
+        return sorted(Notification.objects.values_list("id", flat=True))
+
+    def test_deletes_expired_read_rows_in_batches(self):
+        self.assertIn("Deleted 3 notifications older than 90 days.", self.prune("--batch-size", "2"))
+        self.assertEqual(self.remaining(), self.ids[3:])
+
+    def test_dry_run_and_max_batches(self):
+        self.assertIn("3 notifications older than 90 days would be deleted.", self.prune("--dry-run"))
+        self.assertEqual(len(self.remaining()), 6)
+        self.prune("--batch-size", "1", "--max-batches", "2")
+        self.assertEqual(self.remaining(), self.ids[2:])
+
+    def test_days_option(self):
+        self.assertIn("Deleted 0 notifications", self.prune("--days", "365"))
+        self.assertIn("Deleted 4 notifications", self.prune("--days", "0"))
+        self.assertEqual(self.remaining(), self.ids[3:5])
+
+    def test_recipient_without_state_keeps_unread_rows(self):
+        NotificationState.objects.filter(user=self.user).delete()
+        self.prune()
+        self.assertEqual(self.remaining(), [self.ids[0], self.ids[1], *self.ids[3:]])
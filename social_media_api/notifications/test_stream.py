@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from accounts.models import CustomUser
+
+from .models import Notification, NotificationState
+from .utils import create_notification
+
+
+def parse_event(chunk):
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().splitlines())
+    return fields["id"], json.loads(fields["data"])
+
+
+@override_settings(
+    NOTIFICATIONS_ASYNC=False, NOTIFICATION_STREAM_HEARTBEAT=0.2, NOTIFICATION_STREAM_POLL_INTERVAL=0.05,
+)
+class NotificationStreamTests(TransactionTestCase):
+    def setUp(self):
+        caches["shared"].clear()
+        self.user = CustomUser.objects.create_user("owner", password="pass12345")
+        self.others = [CustomUser.objects.create_user(f"other{i}", password="pass12345") for i in range(3)]
+        self.key = Token.objects.get(user=self.user).key
+
+    async def open(self, **headers):
+        response = await AsyncClient().get("/api/notifications/stream/", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = response.streaming_content.__aiter__()
+        self.assertIn(b"retry:", await events.__anext__())
+        return events
+
+    async def next_chunk(self, events):
+        return await asyncio.wait_for(events.__anext__(), 2)
+
+    async def test_requires_a_valid_token(self):
+        client = AsyncClient()
+        self.assertEqual((await client.get("/api/notifications/stream/")).status_code, 401)
+        response = await client.get("/api/notifications/stream/", headers={"Authorization": "Token nope"})
+        self.assertEqual(response.status_code, 401)
+        response = await client.get(f"/api/notifications/stream/?token={self.key}")
+        self.assertEqual(response.status_code, 200)
+        await response.streaming_content.__aiter__().aclose()
+
+    async def test_live_notification_after_keep_alive(self):
+        events = await self.open(Authorization=f"Token {self.key}")
+        self.assertIn(b"keep-alive", await self.next_chunk(events))
+        await sync_to_async(create_notification)(recipient=self.user, actor=self.others[0], verb="followed you")
+        chunk = await self.next_chunk(events)
+        self.assertIn(b"event: notification", chunk)
+        self.assertEqual(parse_event(chunk)[1]["verb"], "followed you")
+        await events.aclose()
+
+    async def test_replay_resumes_inside_a_shared_timestamp(self):
+        @sync_to_async
+        def backlog():
+            rows = [
+                create_notification(recipient=self.user, actor=other, verb=f"verb {i}")
+                for i, other in enumerate(self.others)
+            ]
+            Notification.objects.filter(recipient=self.user).update(timestamp=timezone.now())
+            NotificationState.objects.filter(user=self.user).update(read_watermark=rows[1].pk)
+            return [Notification.objects.get(pk=row.pk) for row in rows]
+
+        rows = await backlog()
+        events = await self.open(**{
+            "Authorization": f"Token {self.key}",
+            "Last-Event-ID": f"{rows[0].timestamp.isoformat()},{rows[0].id}",
+        })
+        replayed = [parse_event(await self.next_chunk(events)) for _ in range(2)]
+        self.assertEqual([data["id"] for _, data in replayed], [rows[1].id, rows[2].id])
+        self.assertEqual([data["is_read"] for _, data in replayed], [True, False])
+        self.assertEqual(replayed[-1][0], f"{rows[2].timestamp.isoformat()},{rows[2].id}")
+        self.assertIn(b"keep-alive", await self.next_chunk(events))
+        await events.aclose()
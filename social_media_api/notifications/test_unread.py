@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+from posts.models import Post
+
+from .models import Notification
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False)
+class UnreadCountTests(APITestCase):
+    """The per-user unread counter follows new groups and single reads."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user("owner", password="pass12345")
+        self.post = Post.objects.create(author=self.user, title="t", content="c")
+        self.others = [CustomUser.objects.create_user(f"other{i}", password="pass12345") for i in range(3)]
+
+    def like(self, user):
+        self.client.force_authenticate(user)
+        self.client.post(f"/api/posts/posts/{self.post.id}/like/")
+
+    def unread_count(self):
+        self.client.force_authenticate(self.user)
+        return self.client.get("/api/notifications/notifications/unread_count/").data["unread_count"]
+
+    def test_grouped_likes_count_once(self):
+        for other in self.others:
+            self.like(other)
+            self.client.post(f"/api/accounts/follow/{self.user.id}/")
+        self.assertEqual(self.unread_count(), 2)
+
+    def test_single_read_and_mark_all_read(self):
+        for other in self.others:
+            self.like(other)
+            self.client.post(f"/api/accounts/follow/{self.user.id}/")
+        liked = Notification.objects.get(verb="liked your post")
+        self.client.force_authenticate(self.user)
+        self.client.post(f"/api/notifications/notifications/{liked.id}/read/")
+        self.client.post(f"/api/notifications/notifications/{liked.id}/read/")
+        self.assertEqual(self.unread_count(), 1)
+        self.client.post("/api/notifications/notifications/mark_all_read/")
+        self.assertEqual(self.unread_count(), 0)
+
+    def test_count_is_one_primary_key_lookup(self):
+        self.like(self.others[0])
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.client.get("/api/notifications/notifications/unread_count/").data["unread_count"], 1
+            )
+
+    def test_user_without_notifications(self):
+        self.assertEqual(self.unread_count(), 0)
@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+from posts.models import Post
+
+from .models import Notification, NotificationState
+from .utils import create_notification
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False)
+class ReadWatermarkTests(APITestCase):
+    """mark_all_read moves NotificationState.read_watermark instead of updating rows."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user("owner", password="pass12345")
+        self.post = Post.objects.create(author=self.user, title="t", content="c")
+        self.others = [CustomUser.objects.create_user(f"other{i}", password="pass12345") for i in range(2)]
+
+    def like(self, user):
+        self.client.force_authenticate(user)
+        self.client.post(f"/api/posts/posts/{self.post.id}/like/")
+
+    def unread(self):
+        self.client.force_authenticate(self.user)
+        count = self.client.get("/api/notifications/notifications/unread_count/").data["unread_count"]
+        return count, self.client.get("/api/notifications/notifications/?unread=true").data["results"]
+
+    def test_mark_all_read_writes_no_notification_rows(self):
+        self.like(self.others[0])
+        self.client.force_authenticate(self.user)
+        self.client.post("/api/notifications/notifications/mark_all_read/")
+        self.assertFalse(Notification.objects.filter(is_read=True).exists())
+        response = self.client.get("/api/notifications/notifications/")
+        self.assertTrue(all(n["is_read"] for n in response.data["results"]))
+        self.assertEqual(self.unread(), (0, []))
+
+    def test_new_like_after_the_watermark_opens_a_fresh_group(self):
+        self.like(self.others[0])
+        self.client.force_authenticate(self.user)
+        self.client.post("/api/notifications/notifications/mark_all_read/")
+        self.like(self.others[1])
+        self.assertEqual(Notification.objects.filter(verb="liked your post").count(), 2)
+        count, results = self.unread()
+        self.assertEqual((count, len(results)), (1, 1))
+        self.client.post(f"/api/notifications/notifications/{results[0]['id']}/read/")
+        self.assertEqual(self.unread(), (0, []))
+
+    def test_delivery_racing_mark_all_read_stays_consistent(self):
+        self.like(self.others[0])
+        select_for_update = NotificationState.objects.select_for_update
+
+        def deliver_then_lock():
+            # A notification commits while mark_all_read waits for the state row lock
+            create_notification(recipient=self.user, actor=self.others[1], verb="followed you")
+            return select_for_update()
+
+        self.client.force_authenticate(self.user)
+        with mock.patch.object(NotificationState.objects, "select_for_update", side_effect=deliver_then_lock):
+            self.client.post("/api/notifications/notifications/mark_all_read/")
+        self.assertEqual(self.unread(), (0, []))
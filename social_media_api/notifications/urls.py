@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import NotificationViewSet
+from .stream import notification_stream
 
 router = DefaultRouter()
 router.register(r"notifications", NotificationViewSet, basename="notifications")
 
 urlpatterns = [
+    path("stream/", notification_stream, name="notification-stream"),
     path("", include(router.urls)),
 ]
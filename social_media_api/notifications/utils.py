@@ -1,19 +1,46 @@
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from .models import Notification
 
-def create_notification(*, recipient, actor, verb: str, target=None):
+from . import outbox
+from .delivery import deliver
+
+def _ref(obj):
+    if obj is None:
+        return None, None
+    return ContentType.objects.get_for_model(obj.__class__).pk, obj.pk
+
+def _payload(recipient, actor, verb, target=None, action_object=None):
+    target_ct_id, target_id = _ref(target)
+    action_ct_id, action_id = _ref(action_object)
+    return {
+        "recipient_id": recipient.pk,
+        "actor_id": actor.pk,
+        "verb": verb,
+        "target_content_type_id": target_ct_id,
+        "target_object_id": target_id,
+        "action_object_content_type_id": action_ct_id,
+        "action_object_id": action_id,
+    }
+
+def create_notification(*, recipient, actor, verb: str, target=None, action_object=None):
     # Avoid self-notifications for most interactions
     if recipient == actor:
         return None
-    target_ct = None
-    target_id = None
-    if target is not None:
-        target_ct = ContentType.objects.get_for_model(target.__class__)
-        target_id = target.id
-    return Notification.objects.create(
-        recipient=recipient,
-        actor=actor,
-        verb=verb,
-        target_content_type=target_ct,
-        target_object_id=target_id,
-    )
+    return deliver([_payload(recipient, actor, verb, target, action_object)])[0]
+
+def notify(*, recipient, actor, verb: str, target=None, action_object=None):
+    """Create a notification, through the outbox when NOTIFICATIONS_ASYNC is on.
+
+    Events group by `target`; `action_object` (e.g. the new comment) is kept for the latest one.
+    """
+    notify_many([(recipient, actor, verb, target, action_object)])
+
+def notify_many(items):
+    """Batch variant of notify() for (recipient, actor, verb, target[, action_object]) tuples."""
+    payloads = [_payload(*item) for item in items if item[0] != item[1]]
+    if not payloads:
+        return
+    if settings.NOTIFICATIONS_ASYNC:
+        outbox.enqueue(payloads)
+    else:
+        deliver(payloads)
@@ -1,23 +1,67 @@
+from django.db import transaction
+from django.db.models import F, Max
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Notification
+from .models import Notification, NotificationState
 from .serializers import NotificationSerializer
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_read_watermark(self):
+        if not hasattr(self, "_read_watermark"):
+            self._read_watermark = NotificationState.watermark_for(self.request.user)
+        return self._read_watermark
+
     def get_queryset(self):
-        qs = Notification.objects.filter(recipient=self.request.user).select_related("actor", "recipient")
+        qs = (
+            Notification.objects.filter(recipient=self.request.user)
+            .select_related("actor", "recipient")
+            .prefetch_related("target", "action_object")
+        )
         unread = self.request.query_params.get("unread")
         if unread and unread.lower() in ["true", "1", "yes"]:
-            qs = qs.filter(is_read=False)
+            qs = qs.filter(is_read=False, id__gt=self.get_read_watermark())
         return qs
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if getattr(self.request, "user", None) and self.request.user.is_authenticated:
+            context["read_watermark"] = self.get_read_watermark()
+        return context
+
     @action(detail=False, methods=["post"], url_path="mark_all_read")
+    @transaction.atomic
     def mark_all_read(self, request):
-        updated = Notification.objects.filter(recipient=request.user, is_read=False).update(is_read=True)
+        # Move the watermark past every existing notification: one row written, however many are unread.
+        # Lock first: a delivery committing before the lock is then both counted and covered by Max("id"),
+        # and one still in flight waits to add its +1 above the new watermark.
+        state, _ = NotificationState.objects.select_for_update().get_or_create(user=request.user)
+        latest = Notification.objects.aggregate(latest=Max("id"))["latest"] or 0
+        updated = state.unread_count
+        state.read_watermark = max(state.read_watermark, latest)
+        state.unread_count = 0
+        state.save(update_fields=["read_watermark", "unread_count"])
         return Response({"detail": f"Marked {updated} notifications as read."})
+
+    @action(detail=True, methods=["post"], url_path="read")
+    @transaction.atomic
+    def read(self, request, pk=None):
+        updated = Notification.objects.filter(
+            pk=pk, recipient=request.user, is_read=False, id__gt=self.get_read_watermark()
+        ).update(is_read=True)
+        if updated:
+            NotificationState.objects.filter(user=request.user, unread_count__gt=0).update(
+                unread_count=F("unread_count") - 1
+            )
+        return Response({"detail": "Marked as read." if updated else "Already read."})
+
+    @action(detail=False, methods=["get"], url_path="unread_count")
+    def unread_count(self, request):
+        # Single primary-key lookup on the per-user counter
+        count = NotificationState.objects.filter(user=request.user).values_list("unread_count", flat=True).first()
+        return Response({"unread_count": count or 0})
@@ -0,0 +1,87 @@
+"""Versioned response cache for hot post/feed endpoints.
+
+Each cached response is stored with the version tokens of the data it was built from
+(e.g. "posts", "post:<id>", "graph:<user_id>"). Writes bump tokens instead of deleting
+keys, so every dependent entry becomes stale at once. Stale entries are rebuilt by a
+single worker holding a short lock; concurrent readers serve the stale copy meanwhile.
+"""
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from social_media_api import metrics
+
+def _cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+def _version_key(name):
+    return f"respcache:v:{name}"
+
+def get_versions(names):
+    cache = _cache()
+    keys = [_version_key(n) for n in names]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            # Never reuse a version after eviction: start from a fresh random token
+            cache.add(key, uuid.uuid4().hex, None)
+            found[key] = cache.get(key)
+        versions.append(found[key])
+    return tuple(versions)
+
+def bump(*names):
+    _cache().set_many({_version_key(n): uuid.uuid4().hex for n in names}, None)
+
+def _entry_key(request, scope):
+    viewer = request.user.pk if request.user.is_authenticated else "anon"
+    digest = hashlib.md5(request.build_absolute_uri().encode("utf-8")).hexdigest()
+    return f"respcache:{scope}:{viewer}:{digest}"
+
+def cached_response(request, scope, version_names, build):
+    """Return a cached Response for a GET, rebuilding through `build()` when stale."""
+    if not settings.RESPONSE_CACHE_ENABLED or request.method != "GET":
+        return build()
+
+    cache = _cache()
+    key = _entry_key(request, scope)
+    versions = get_versions(version_names)
+    entry = cache.get(key)
+    if entry and entry["versions"] == versions and entry["fresh_until"] > time.time():
+        metrics.incr("respcache.hit")
+        return Response(entry["data"], headers={"X-Cache": "HIT"})
+
+    lock_key = f"{key}:lock"
+    if not cache.add(lock_key, 1, settings.RESPONSE_CACHE_LOCK_TIMEOUT):
+        if entry:
+            # Someone else is rebuilding: serve the stale copy rather than piling on the DB
+            metrics.incr("respcache.stale")
+            return Response(entry["data"], headers={"X-Cache": "STALE"})
+        deadline = time.monotonic() + settings.RESPONSE_CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry and entry["versions"] == versions:
+                metrics.incr("respcache.waited")
+                return Response(entry["data"], headers={"X-Cache": "HIT"})
+        lock_key = None
+
+    try:
+        metrics.incr("respcache.miss")
+        response = build()
+        if response.status_code == 200:
+            entry = {
+                "versions": versions,
+                "fresh_until": time.time() + settings.RESPONSE_CACHE_TIMEOUT,
+                "data": response.data,
+            }
+            cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT + settings.RESPONSE_CACHE_STALE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
@@ -0,0 +1,79 @@
+import heapq
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from social_media_api import metrics
+from social_media_api.pagination import keyset_filter
+
+from .models import Post, TimelineEntry
+
+PULL_AUTHORS_CACHE_KEY = "feed:pull_author_ids"
+
+metrics.gauge("feed.hybrid_follower_threshold", lambda: settings.FEED_HYBRID_FOLLOWER_THRESHOLD)
+metrics.gauge("feed.pull_authors", lambda: len(pull_author_ids()))
+
+def hybrid_enabled():
+    return settings.FEED_HYBRID_FOLLOWER_THRESHOLD > 0
+
+def pull_author_ids():
+    """Ids of authors read on the pull (read-time) path.
+
+    That is authors over the follower threshold, plus authors who dropped below it but still
+    have posts that were never fanned out, until `backfill_timelines --demoted` pushes them.
+    """
+    ids = cache.get(PULL_AUTHORS_CACHE_KEY)
+    if ids is None:
+        unfanned = set(Post.objects.filter(fanned_out=False).values_list("author_id", flat=True).distinct())
+        popular = set()
+        if hybrid_enabled():
+            popular = set(
+                get_user_model().objects.filter(followers_count__gte=settings.FEED_HYBRID_FOLLOWER_THRESHOLD)
+                .values_list("id", flat=True)
+            )
+        ids = frozenset(popular | unfanned)
+        cache.set(PULL_AUTHORS_CACHE_KEY, ids, settings.FEED_HYBRID_CACHE_SECONDS)
+    return ids
+
+def is_pull_author(author_id):
+    return author_id in pull_author_ids()
+
+class HybridFeed:
+    """Feed merging the pushed timeline with posts pulled from high-follower authors.
+
+    Both sides are read as (created_at, post_id) keys with the same keyset bounds and merged
+    lazily, so a page only reads `limit` keys from each side. Supports KeysetPagination via
+    `keyset_window()` as well as plain slicing.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.pushed = TimelineEntry.objects.filter(owner=user)
+        self.pulled_authors = list(user.following.filter(id__in=pull_author_ids()).values_list("id", flat=True))
+        self.pulled = Post.objects.filter(author_id__in=self.pulled_authors)
+        metrics.incr("feed.reads")
+        if self.pulled_authors:
+            metrics.incr("feed.hybrid_reads")
+            metrics.incr("feed.pulled_authors", len(self.pulled_authors))
+
+    def keyset_window(self, position=None, reverse=False, since=None, until=None, limit=None):
+        bounds = {"position": position, "reverse": reverse, "since": since, "until": until}
+        pushed = keyset_filter(self.pushed, ("-created_at", "-post_id"), **bounds).values_list("created_at", "post_id")[:limit]
+        if not self.pulled_authors:
+            keys = list(pushed)
+        else:
+            with metrics.timer("feed.merge_ms"):
+                pulled = keyset_filter(self.pulled, ("-created_at", "-id"), **bounds).values_list("created_at", "id")[:limit]
+                seen = set()
+                merged = heapq.merge(pushed, pulled, reverse=not reverse)
+                keys = list(islice((k for k in merged if not (k[1] in seen or seen.add(k[1]))), limit))
+        posts = Post.objects.select_related("author").in_bulk([post_id for _, post_id in keys])
+        return [posts[post_id] for _, post_id in keys if post_id in posts]
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        start, stop = item.start or 0, item.stop
+        return self.keyset_window(limit=stop)[start:]
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from posts import feed, timeline
+
+class Command(BaseCommand):
+    help = "Rebuild materialized home timelines from existing follow relationships."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="user_ids", help="Only rebuild these user ids.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Users loaded per query.")
+        parser.add_argument(
+            "--demoted", action="store_true", help="Only push posts of authors that fell below the hybrid threshold."
+        )
+
+    def handle(self, *args, user_ids=None, batch_size=500, demoted=False, **options):
+        if demoted:
+            authors = timeline.push_demoted_authors()
+            cache.delete(feed.PULL_AUTHORS_CACHE_KEY)
+            self.stdout.write(self.style.SUCCESS(f"Pushed skipped posts of {authors} demoted authors."))
+            return
+
+        qs = get_user_model().objects.filter(following__isnull=False).distinct().order_by("id")
+        if user_ids:
+            qs = get_user_model().objects.filter(id__in=user_ids).order_by("id")
+
+        rebuilt = 0
+        for owner_id in qs.values_list("id", flat=True).iterator(chunk_size=batch_size):
+            follows = timeline.rebuild_timeline(owner_id)
+            rebuilt += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"user {owner_id}: {follows} followed authors")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} timelines."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from posts import search
+
+class Command(BaseCommand):
+    help = "Create (if missing) and rebuild the post full-text search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database alias.")
+
+    def handle(self, *args, database=DEFAULT_DB_ALIAS, **options):
+        backend = search.get_backend(database)
+        if backend is None:
+            self.stdout.write("No full-text backend for this database; search uses icontains.")
+            return
+        backend.install(connections[database])
+        rebuilt = backend.rebuild(connections[database])
+        verb = "Rebuilt" if rebuilt else "Verified"
+        self.stdout.write(self.style.SUCCESS(f"{verb} the {type(backend).__name__} search index."))
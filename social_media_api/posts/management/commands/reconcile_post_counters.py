@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.models import Comment, Like, Post
+
+def _count_of(model):
+    counted = model.objects.filter(post=OuterRef("pk")).order_by().values("post").annotate(n=Count("id")).values("n")
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+class Command(BaseCommand):
+    help = "Repair drift in Post.likes_count / Post.comments_count, one id range at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Posts checked per batch.")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing.")
+
+    def handle(self, *args, batch_size=1000, sleep=0.0, dry_run=False, **options):
+        last_id, checked, repaired = 0, 0, 0
+        while True:
+            ids = list(Post.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            checked += len(ids)
+
+            drifted = list(
+                Post.objects.filter(id__in=ids)
+                .annotate(actual_likes=_count_of(Like), actual_comments=_count_of(Comment))
+                .exclude(likes_count=F("actual_likes"), comments_count=F("actual_comments"))
+                .values_list("id", "likes_count", "actual_likes", "comments_count", "actual_comments")
+            )
+            if drifted and not dry_run:
+                # Recount inside the UPDATE so concurrent F() increments are not overwritten
+                Post.objects.filter(id__in=[row[0] for row in drifted]).update(
+                    likes_count=_count_of(Like), comments_count=_count_of(Comment)
+                )
+            repaired += len(drifted)
+            if options["verbosity"] > 1:
+                for post_id, likes, actual_likes, comments, actual_comments in drifted:
+                    self.stdout.write(f"post {post_id}: likes {likes}->{actual_likes}, comments {comments}->{actual_comments}")
+            if sleep:
+                time.sleep(sleep)
+
+        verb = "Found" if dry_run else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} posts. {verb} {repaired} with drift."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts import trending
+
+class Command(BaseCommand):
+    help = "Re-normalize trending scores to a new decay epoch and refresh the trending top-K."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Posts rescaled per UPDATE.")
+        parser.add_argument("--top-k", type=int, default=None, help="Posts kept (default TRENDING_TOP_K).")
+
+    def handle(self, *args, batch_size=5000, top_k=None, **options):
+        rescaled, top_ids = trending.renormalize(batch_size=batch_size, top_k=top_k)
+        if options["verbosity"] > 1:
+            self.stdout.write(f"top: {top_ids[:10]}")
+        self.stdout.write(self.style.SUCCESS(f"Rescaled {rescaled} posts. {len(top_ids)} trending."))
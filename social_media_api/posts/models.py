@@ -1,3 +1,5 @@
+import time
+
 from django.conf import settings
 from django.db import models
 
@@ -8,6 +10,28 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized counters, updated with F() in the like/unlike and comment views;
+    # `python manage.py reconcile_post_counters` repairs drift
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    # False while the post was skipped by fan-out (pull author); such posts stay on the pull path
+    # until `backfill_timelines --demoted` pushes them
+    fanned_out = models.BooleanField(default=True)
+    # Forward-decayed engagement relative to trending_epoch (a Unix timestamp); writes rebase it
+    # onto TrendingState.epoch (see posts.trending)
+    trending_score = models.FloatField(default=0.0)
+    trending_epoch = models.FloatField(default=time.time)
+
+    class Meta:
+        # Match the keyset pagination order (created_at, id) for global and per-author listings
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="post_created_idx"),
+            models.Index(fields=["author", "-created_at", "-id"], name="post_author_created_idx"),
+            # update_trending only visits posts with engagement
+            models.Index(fields=["id"], condition=models.Q(trending_score__gt=0), name="post_trending_idx"),
+            models.Index(fields=["author"], condition=models.Q(fanned_out=False), name="post_unfanned_idx"),
+        ]
+
     def __str__(self):
         return f"{self.title} by {self.author}"
 
@@ -18,6 +42,12 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="comment_created_idx"),
+            models.Index(fields=["post", "-created_at", "-id"], name="comment_post_created_idx"),
+        ]
+
     def __str__(self):
         return f"Comment by {self.author} on {self.post_id}"
 
@@ -33,3 +63,39 @@ class Like(models.Model):
 
     def __str__(self):
         return f"{self.user} liked {self.post_id}"
+
+class TimelineEntry(models.Model):
+    """Materialized home-timeline row: `post` is in `owner`'s feed (fan-out-on-write)."""
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="timeline_entries")
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="timeline_entries")
+    # Denormalized from the post so unfollow pruning and feed reads never join posts_post
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "post"], name="unique_timeline_entry_per_owner_post")
+        ]
+        indexes = [
+            models.Index(fields=["owner", "-created_at", "-post"], name="timeline_owner_created_idx"),
+            models.Index(fields=["owner", "author"], name="timeline_owner_author_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} in timeline of {self.owner_id}"
+
+class TrendingState(models.Model):
+    """Singleton (pk=1): current decay epoch and the precomputed trending top-K."""
+
+    # Unix timestamp the stored trending scores are relative to
+    epoch = models.FloatField(default=time.time)
+    top_ids = models.JSONField(default=list)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"epoch {self.epoch:.0f}: {len(self.top_ids)} trending posts"
+
+    @classmethod
+    def load(cls):
+        return cls.objects.get_or_create(pk=1)[0]
@@ -0,0 +1,150 @@
+"""Full-text search over Post title/content, ranked by relevance.
+
+The backend follows the database (POST_SEARCH_BACKEND="auto"):
+- postgres: a stored generated `search_vector` tsvector column (title weighted above content)
+  with a GIN index; matched with websearch_to_tsquery and ranked with ts_rank_cd.
+- sqlite:   an external-content FTS5 table kept in sync by triggers; ranked with bm25().
+- like:     DRF SearchFilter's icontains scan (other databases, or FTS5 missing).
+The index objects are created idempotently after `migrate` (post_migrate), and the database
+maintains them on every insert/update/delete. Ranked querysets expose `search_rank` (higher
+is better) and are ordered by ("-search_rank", "-id"), so keyset cursors page by rank.
+"""
+import logging
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "posts_post_fts"
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+class PostgresBackend:
+    config = "english"
+
+    def install(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "ALTER TABLE posts_post ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+                f"setweight(to_tsvector('{self.config}', coalesce(title, '')), 'A') || "
+                f"setweight(to_tsvector('{self.config}', coalesce(content, '')), 'B')) STORED"
+            )
+            cursor.execute("CREATE INDEX IF NOT EXISTS post_search_vector_idx ON posts_post USING GIN (search_vector)")
+
+    def rebuild(self, connection):
+        # Generated column: always current
+        return False
+
+    def search(self, queryset, text):
+        query = f"websearch_to_tsquery('{self.config}', %s)"
+        return queryset.alias(
+            search_match=RawSQL(f'"posts_post"."search_vector" @@ {query}', [text], output_field=BooleanField())
+        ).filter(search_match=True).annotate(
+            search_rank=RawSQL(f'ts_rank_cd("posts_post"."search_vector", {query})', [text], output_field=FloatField())
+        )
+
+class SQLiteBackend:
+    def install(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{FTS_TABLE}'")
+            exists = cursor.fetchone() is not None
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "title, content, content='posts_post', content_rowid='id', tokenize='porter unicode61')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS posts_post_fts_ai AFTER INSERT ON posts_post BEGIN "
+                f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS posts_post_fts_ad AFTER DELETE ON posts_post BEGIN "
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) "
+                f"VALUES ('delete', old.id, old.title, old.content); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS posts_post_fts_au AFTER UPDATE OF title, content ON posts_post BEGIN "
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) "
+                f"VALUES ('delete', old.id, old.title, old.content); "
+                f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content); END"
+            )
+        if not exists:
+            # First install on a populated table: index the existing rows
+            self.rebuild(connection)
+
+    def rebuild(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        return True
+
+    @staticmethod
+    def match_expression(text):
+        # Quote every term: user input must never be parsed as FTS5 query syntax
+        return " ".join(f'"{term}"' for term in TERM_RE.findall(text))
+
+    def search(self, queryset, text):
+        expression = self.match_expression(text)
+        if not expression:
+            # Still annotated, so the caller's ordering by search_rank resolves
+            return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression])
+        ).annotate(
+            # bm25() is lower-is-better; negate so every backend ranks descending. Title hits weigh double.
+            search_rank=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}, 2.0, 1.0) FROM {FTS_TABLE} "
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "posts_post"."id"',
+                [expression],
+                output_field=FloatField(),
+            )
+        )
+
+def _sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any(row[0] == "ENABLE_FTS5" for row in cursor.fetchall())
+
+def get_backend(using="default"):
+    """The full-text backend for a database alias, or None to fall back to icontains."""
+    connection = connections[using]
+    name = settings.POST_SEARCH_BACKEND
+    if name == "auto":
+        name = connection.vendor
+    if name in ("postgres", "postgresql"):
+        return PostgresBackend() if connection.vendor == "postgresql" else None
+    if name == "sqlite":
+        if connection.vendor != "sqlite":
+            return None
+        if not hasattr(connection, "_posts_has_fts5"):
+            connection._posts_has_fts5 = _sqlite_has_fts5(connection)
+        return SQLiteBackend() if connection._posts_has_fts5 else None
+    return None
+
+def install(sender=None, using="default", **kwargs):
+    """post_migrate hook: create the index objects for the active backend."""
+    backend = get_backend(using)
+    if backend is None:
+        logger.info("Post search falls back to icontains on database %r", using)
+        return
+    backend.install(connections[using])
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Drop-in for SearchFilter (same ?search= parameter) backed by the full-text index."""
+
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").replace("\x00", "").strip()
+        if not text:
+            return queryset
+        backend = get_backend(queryset.db)
+        if backend is None:
+            return SearchFilter().filter_queryset(request, queryset, view)
+        return backend.search(queryset, text).order_by("-search_rank", "-id")
+
+    def get_schema_operation_parameters(self, view):
+        return SearchFilter().get_schema_operation_parameters(view)
@@ -1,14 +1,43 @@
 from rest_framework import serializers
-from .models import Post, Comment
+from .models import Post, Comment, Like
+
+def viewer_state(user, post_ids):
+    """Per-viewer flags for a page of posts: one set-membership query per flag, never per post."""
+    if not (user and user.is_authenticated and post_ids):
+        return {"liked": frozenset()}
+    liked = Like.objects.filter(user=user, post_id__in=post_ids).values_list("post_id", flat=True)
+    return {"liked": frozenset(liked)}
+
+class PostListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        posts = list(data.all() if hasattr(data, "all") else data)
+        request = self.context.get("request")
+        self.context["viewer_state"] = viewer_state(getattr(request, "user", None), [p.pk for p in posts])
+        return super().to_representation(posts)
 
 class PostSerializer(serializers.ModelSerializer):
     author = serializers.StringRelatedField(read_only=True)
-    likes_count = serializers.IntegerField(source="likes.count", read_only=True)
-    comments_count = serializers.IntegerField(source="comments.count", read_only=True)
+    liked_by_me = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
-        fields = ["id", "author", "title", "content", "created_at", "updated_at", "likes_count", "comments_count"]
+        fields = [
+            "id", "author", "title", "content", "created_at", "updated_at",
+            "likes_count", "comments_count", "liked_by_me",
+        ]
+        read_only_fields = ["likes_count", "comments_count"]
+        list_serializer_class = PostListSerializer
+
+    def _viewer_state(self, obj):
+        state = self.context.get("viewer_state")
+        if state is None:
+            # Single post (retrieve/create): one lookup for this post only
+            request = self.context.get("request")
+            state = viewer_state(getattr(request, "user", None), [obj.pk])
+        return state
+
+    def get_liked_by_me(self, obj):
+        return obj.pk in self._viewer_state(obj)["liked"]
 
     def create(self, validated_data):
         request = self.context.get("request")
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.graph import follow_edges
+from social_media_api import metrics
+
+from .models import Comment, Like, Post
+from . import cache, feed, timeline
+
+User = get_user_model()
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance=None, created=False, **kwargs):
+    if not (created and settings.FEED_FANOUT):
+        return
+    if feed.is_pull_author(instance.author_id):
+        # High-follower authors are merged in at read time instead of written to every timeline
+        metrics.incr("feed.fanout_skipped")
+        Post.objects.filter(pk=instance.pk).update(fanned_out=False)
+        return
+    timeline.fan_out_post(instance)
+
+@receiver(m2m_changed, sender=User.followers.through)
+def sync_timelines_with_follows(sender, instance, action, reverse, pk_set, **kwargs):
+    if not settings.FEED_FANOUT:
+        return
+    if action == "pre_clear":
+        # pk_set is None for clear(); capture the edges before they disappear
+        related = instance.following if reverse else instance.followers
+        pk_set = set(related.values_list("id", flat=True))
+        action = "post_remove"
+    if not pk_set:
+        return
+    follower_ids, followed_ids = follow_edges(instance, reverse, pk_set)
+    if action == "post_add":
+        timeline.add_authors_to_timelines(follower_ids, followed_ids)
+    elif action == "post_remove":
+        timeline.remove_authors_from_timeline(follower_ids, followed_ids)
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Like)
+def invalidate_post_responses(sender, instance, **kwargs):
+    post_id = instance.pk if sender is Post else instance.post_id
+    transaction.on_commit(lambda: cache.bump("posts", f"post:{post_id}"))
+
+@receiver(m2m_changed, sender=User.followers.through)
+def invalidate_feed_responses(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        names = [f"graph:{instance.pk}"]
+    elif pk_set:
+        names = [f"graph:{pk}" for pk in pk_set]
+    else:
+        # followers.clear(): the former followers are unknown here, drop every feed entry
+        names = ["posts"]
+    transaction.on_commit(lambda: cache.bump(*names))
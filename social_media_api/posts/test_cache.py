@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+
+from .models import Post
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False)
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = CustomUser.objects.create_user("author", password="pass12345")
+        self.reader = CustomUser.objects.create_user("reader", password="pass12345")
+        self.post = Post.objects.create(author=self.author, title="t", content="c")
+        self.client.force_authenticate(self.reader)
+
+    def test_hit_then_invalidated_by_like(self):
+        self.assertEqual(self.client.get("/api/posts/posts/")["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/posts/posts/")["X-Cache"], "HIT")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/posts/posts/{self.post.id}/like/")
+        response = self.client.get("/api/posts/posts/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertTrue(response.data["results"][0]["liked_by_me"])
+
+    def test_feed_invalidated_by_follow(self):
+        self.assertEqual(self.client.get("/api/posts/feed/").data["results"], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/accounts/follow/{self.author.id}/")
+        self.assertEqual(len(self.client.get("/api/posts/feed/").data["results"]), 1)
+
+    def test_new_post_invalidates_list(self):
+        self.client.get("/api/posts/posts/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(author=self.author, title="t2", content="c")
+        self.assertEqual(len(self.client.get("/api/posts/posts/").data["results"]), 2)
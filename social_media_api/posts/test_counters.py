@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+
+from .models import Comment, Like, Post
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False)
+class CounterTests(APITestCase):
+    """likes_count / comments_count follow every write path and can be reconciled."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = CustomUser.objects.create_user("author", password="pass12345")
+        self.reader = CustomUser.objects.create_user("reader", password="pass12345")
+        self.post = Post.objects.create(author=self.author, title="t", content="c")
+        self.client.force_authenticate(self.reader)
+
+    def counts(self):
+        self.post.refresh_from_db()
+        return self.post.likes_count, self.post.comments_count
+
+    def test_like_comment_and_undo(self):
+        self.client.post(f"/api/posts/posts/{self.post.id}/like/")
+        self.client.post(f"/api/posts/posts/{self.post.id}/like/")
+        comment_id = self.client.post("/api/posts/comments/", {"post": self.post.id, "content": "hi"}).data["id"]
+        self.assertEqual(self.counts(), (1, 1))
+        self.client.delete(f"/api/posts/comments/{comment_id}/")
+        self.client.post(f"/api/posts/posts/{self.post.id}/unlike/")
+        self.client.post(f"/api/posts/posts/{self.post.id}/unlike/")
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_reconcile_command(self):
+        Like.objects.create(post=self.post, user=self.author)
+        Comment.objects.create(post=self.post, author=self.author, content="x")
+        Post.objects.filter(pk=self.post.pk).update(likes_count=5, comments_count=0)
+        call_command("reconcile_post_counters", stdout=StringIO())
+        self.assertEqual(self.counts(), (1, 1))
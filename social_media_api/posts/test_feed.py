@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+
+from .feed import HybridFeed, pull_author_ids
+from .models import Post, TimelineEntry
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False, FEED_HYBRID_FOLLOWER_THRESHOLD=3)
+class HybridFeedTests(APITestCase):
+    """Pushed timeline entries and pulled high-follower posts merge into one keyset-paged feed."""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = CustomUser.objects.create_user("reader", password="pass12345")
+        self.author = CustomUser.objects.create_user("author", password="pass12345")
+        self.star = CustomUser.objects.create_user("star", password="pass12345")
+        self.author.followers.add(self.reader)
+        self.star.followers.add(self.reader)
+        # Pushed while the star was still below the threshold
+        self.early = Post.objects.create(author=self.star, title="early", content="c")
+        self.star.followers.add(*[CustomUser.objects.create_user(f"fan{i}", password="pass12345") for i in range(2)])
+        cache.clear()
+        self.titles = ["early"]
+        for i in range(12):
+            post = Post.objects.create(author=self.star if i % 2 else self.author, title=f"p{i}", content="c")
+            self.titles.append(post.title)
+        self.client.force_authenticate(self.reader)
+
+    def walk(self, url):
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertLessEqual(len(response.data["results"]), 10)
+            titles += [p["title"] for p in response.data["results"]]
+            url = response.data["next"]
+        return titles
+
+    def test_star_posts_are_pulled_not_pushed(self):
+        self.assertEqual(pull_author_ids(), {self.star.pk})
+        pushed = set(TimelineEntry.objects.filter(owner=self.reader).values_list("post__title", flat=True))
+        self.assertEqual(pushed, {"early", "p0", "p2", "p4", "p6", "p8", "p10"})
+        self.assertFalse(Post.objects.get(title="p1").fanned_out)
+
+    def test_walk_merges_both_sides_newest_first_once(self):
+        self.assertEqual(self.walk("/api/posts/feed/"), self.titles[::-1])
+
+    def test_previous_page_and_window_limits(self):
+        first = self.client.get("/api/posts/feed/")
+        second = self.client.get(first.data["next"])
+        self.assertEqual([p["title"] for p in second.data["results"]], ["p1", "p0", "early"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        window = HybridFeed(self.reader).keyset_window(limit=3)
+        self.assertEqual([p.title for p in window], ["p11", "p10", "p9"])
+
+    def test_unfollowing_the_star_drops_pulled_posts(self):
+        self.reader.following.remove(self.star)
+        cache.clear()
+        self.assertEqual(self.walk("/api/posts/feed/"), [f"p{i}" for i in (10, 8, 6, 4, 2, 0)])
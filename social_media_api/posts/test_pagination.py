@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+
+from .models import Post
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = CustomUser.objects.create_user("author", password="pass12345")
+        self.now = timezone.now()
+        # Pairs of posts share a created_at, so the id tie-breaker matters
+        for i in range(25):
+            post = Post.objects.create(author=self.author, title=f"t{i}", content="c")
+            Post.objects.filter(pk=post.pk).update(created_at=self.now - timedelta(minutes=i // 2))
+
+    def walk(self, url):
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertNotIn("count", response.data)
+            titles += [p["title"] for p in response.data["results"]]
+            url = response.data["next"]
+        return titles
+
+    def test_forward_walk_sees_every_post_once(self):
+        titles = self.walk("/api/posts/posts/")
+        self.assertEqual(len(titles), 25)
+        self.assertEqual(len(set(titles)), 25)
+
+    def test_ascending_walk(self):
+        titles = self.walk("/api/posts/posts/?ordering=created_at")
+        self.assertEqual(titles[0], "t24")
+        self.assertEqual(len(set(titles)), 25)
+
+    def test_previous_returns_the_same_page(self):
+        first = self.client.get("/api/posts/posts/")
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(back.data["previous"])
+
+    def test_since(self):
+        since = (self.now - timedelta(minutes=1)).isoformat()
+        response = self.client.get("/api/posts/posts/", {"since": since})
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_bad_cursor_and_timestamp(self):
+        self.assertEqual(self.client.get("/api/posts/posts/?cursor=zzz").status_code, 404)
+        self.assertEqual(self.client.get("/api/posts/posts/?since=2024-13-45T00:00:00").status_code, 400)
@@ -0,0 +1,77 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+
+from . import search
+from .models import Post
+
+
+class FullTextSearchTests(APITestCase):
+    def setUp(self):
+        if search.get_backend() is None:
+            self.skipTest("no full-text backend for this database")
+        cache.clear()
+        self.author = CustomUser.objects.create_user("author", password="pass12345")
+
+    def post(self, title, content="c"):
+        return Post.objects.create(author=self.author, title=title, content=content)
+
+    def titles(self, text):
+        response = self.client.get("/api/posts/posts/", {"search": text})
+        self.assertEqual(response.status_code, 200)
+        return [p["title"] for p in response.data["results"]]
+
+    def test_title_hits_rank_above_content_hits(self):
+        self.post("gardening notes", "tomatoes and basil")
+        self.post("weekend", "a short word about gardening")
+        self.post("gardening gardening", "gardening all weekend")
+        self.post("unrelated", "nothing here")
+        self.assertEqual(self.titles("gardening"), ["gardening gardening", "gardening notes", "weekend"])
+        # Stemmed terms, every term required
+        self.assertEqual(self.titles("garden tomato"), ["gardening notes"])
+
+    def test_index_follows_updates_and_deletes(self):
+        post = self.post("old title", "first draft")
+        Post.objects.filter(pk=post.pk).update(title="new heading")
+        cache.clear()
+        self.assertEqual(self.titles("heading"), ["new heading"])
+        self.assertEqual(self.titles("old"), [])
+        post.delete()
+        cache.clear()
+        self.assertEqual(self.titles("heading"), [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.post("quotes", 'he said "hello" OR NOT')
+        self.assertEqual(self.titles('"hello OR'), ["quotes"])
+        self.assertEqual(self.titles("***"), [])
+
+    def test_cursor_pages_follow_the_ranking(self):
+        for i in range(15):
+            self.post(f"match {i}", "match " * (i + 1))
+        self.post("other", "no")
+        titles, url = [], "/api/posts/posts/?search=match"
+        while url:
+            response = self.client.get(url)
+            titles += [p["title"] for p in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(len(titles), 15)
+        self.assertEqual(len(set(titles)), 15)
+        self.assertEqual(titles[:10], self.titles("match"))
+
+    def test_rebuild_command_restores_a_stale_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("the tsvector column cannot go stale")
+        post = self.post("lost", "entry")
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {search.FTS_TABLE}({search.FTS_TABLE}) VALUES ('delete-all')")
+        self.assertEqual(self.titles("lost"), [])
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Rebuilt the SQLiteBackend search index.", out.getvalue())
+        cache.clear()
+        self.assertEqual(self.titles("lost"), [post.title])
@@ -0,0 +1,91 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+
+from . import timeline, trending
+from .models import Post, TimelineEntry, TrendingState
+
+
+@override_settings(FEED_FOLLOW_BACKFILL=2)
+class FollowBackfillTests(APITestCase):
+    def setUp(self):
+        self.reader = CustomUser.objects.create_user("reader", password="pass12345")
+        self.authors = [CustomUser.objects.create_user(f"author{i}", password="pass12345") for i in range(5)]
+        for author in self.authors:
+            for i in range(4):
+                Post.objects.create(author=author, title=f"{author.username}-{i}", content="c")
+
+    def test_latest_posts_per_author_in_one_query(self):
+        with self.assertNumQueries(2):
+            timeline.add_authors_to_timeline(self.reader.pk, [a.pk for a in self.authors])
+        entries = TimelineEntry.objects.filter(owner=self.reader)
+        self.assertEqual(entries.count(), 10)
+        titles = set(Post.objects.filter(pk__in=entries.values("post_id")).values_list("title", flat=True))
+        self.assertEqual(titles, {f"{a.username}-{i}" for a in self.authors for i in (2, 3)})
+
+    def test_follow_backfills_the_feed(self):
+        self.client.force_authenticate(self.reader)
+        self.client.post(f"/api/accounts/follow/{self.authors[0].id}/")
+        response = self.client.get("/api/posts/feed/")
+        self.assertEqual([p["title"] for p in response.data["results"]], ["author0-3", "author0-2"])
+
+
+@override_settings(NOTIFICATIONS_ASYNC=False, TRENDING_HALF_LIFE_HOURS=12)
+class TrendingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = CustomUser.objects.create_user("author", password="pass12345")
+        self.fans = [CustomUser.objects.create_user(f"fan{i}", password="pass12345") for i in range(2)]
+        self.post = Post.objects.create(author=self.author, title="t", content="c")
+
+    def like(self, user):
+        self.client.force_authenticate(user)
+        self.client.post(f"/api/posts/posts/{self.post.id}/like/")
+
+    def score_at(self, epoch):
+        """The post's score expressed relative to `epoch`."""
+        self.post.refresh_from_db()
+        return self.post.trending_score * 2 ** ((self.post.trending_epoch - epoch) / (12 * 3600))
+
+    def test_like_uses_the_stored_epoch(self):
+        # Another process moved the epoch a half-life ahead; this one never heard about it
+        epoch = self.post.trending_epoch + 12 * 3600
+        TrendingState.objects.create(pk=1, epoch=epoch)
+        self.like(self.fans[0])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.trending_epoch, epoch)
+        self.assertAlmostEqual(self.post.trending_score, 0.5, places=2)
+
+    def test_like_on_a_row_not_yet_rebased(self):
+        self.like(self.fans[0])
+        before = self.post.trending_epoch
+        # update_trending has moved the epoch but not reached this post yet
+        TrendingState.objects.update_or_create(pk=1, defaults={"epoch": before + 12 * 3600})
+        self.like(self.fans[1])
+        self.assertAlmostEqual(self.score_at(before), 2.0, places=2)
+
+    def test_renormalize_halves_scores_and_keeps_unlike_exact(self):
+        self.like(self.fans[0])
+        self.like(self.fans[1])
+        start = self.score_at(self.post.trending_epoch)
+        rescaled, top_ids = trending.renormalize(now=self.post.trending_epoch + 12 * 3600)
+        self.assertEqual((rescaled, top_ids), (1, [self.post.id]))
+        self.post.refresh_from_db()
+        self.assertAlmostEqual(self.post.trending_score, start / 2, places=6)
+        self.client.post(f"/api/posts/posts/{self.post.id}/unlike/")
+        self.client.force_authenticate(self.fans[0])
+        self.client.post(f"/api/posts/posts/{self.post.id}/unlike/")
+        self.post.refresh_from_db()
+        self.assertAlmostEqual(self.post.trending_score, 0.0, places=6)
+
+    def test_cached_trending_reflects_new_likes(self):
+        self.like(self.fans[1])
+        trending.renormalize()
+        self.client.force_authenticate(self.fans[0])
+        self.assertEqual(self.client.get("/api/posts/trending/").data["results"][0]["likes_count"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.like(self.fans[0])
+        post = self.client.get("/api/posts/trending/").data["results"][0]
+        self.assertEqual((post["likes_count"], post["liked_by_me"]), (2, True))
@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from social_media_api import metrics
+
+from .models import Post, TimelineEntry
+
+def _entry(owner_id, post):
+    return TimelineEntry(owner_id=owner_id, post_id=post.id, author_id=post.author_id, created_at=post.created_at)
+
+def _bulk_insert(entries):
+    TimelineEntry.objects.bulk_create(entries, batch_size=settings.FEED_FANOUT_BATCH_SIZE, ignore_conflicts=True)
+
+def fan_out_post(post):
+    """Push a new post into the timeline of every follower of its author."""
+    follower_ids = (
+        get_user_model().objects.filter(following=post.author_id)
+        .values_list("id", flat=True)
+        .iterator(chunk_size=settings.FEED_FANOUT_BATCH_SIZE)
+    )
+    batch, rows = [], 0
+    with metrics.timer("feed.fanout_ms"):
+        for follower_id in follower_ids:
+            batch.append(_entry(follower_id, post))
+            if len(batch) >= settings.FEED_FANOUT_BATCH_SIZE:
+                _bulk_insert(batch)
+                rows += len(batch)
+                batch = []
+        if batch:
+            _bulk_insert(batch)
+            rows += len(batch)
+    metrics.incr("feed.fanout_rows", rows)
+
+def latest_posts(author_ids, limit):
+    """(id, author_id, created_at) of each author's latest `limit` posts, in one windowed query."""
+    rank = Window(RowNumber(), partition_by=F("author_id"), order_by=(F("created_at").desc(), F("id").desc()))
+    return (
+        Post.objects.filter(author_id__in=author_ids)
+        .annotate(rank=rank)
+        .filter(rank__lte=limit)
+        .values_list("id", "author_id", "created_at")
+    )
+
+def add_authors_to_timelines(owner_ids, author_ids):
+    """Backfill the latest FEED_FOLLOW_BACKFILL posts of newly followed authors into the owners' timelines."""
+    author_ids = list(author_ids)
+    if not owner_ids or not author_ids:
+        return
+    batch = []
+    rows = latest_posts(author_ids, settings.FEED_FOLLOW_BACKFILL).iterator(chunk_size=settings.FEED_FANOUT_BATCH_SIZE)
+    for post_id, author_id, created_at in rows:
+        for owner_id in owner_ids:
+            batch.append(TimelineEntry(owner_id=owner_id, post_id=post_id, author_id=author_id, created_at=created_at))
+        if len(batch) >= settings.FEED_FANOUT_BATCH_SIZE:
+            _bulk_insert(batch)
+            batch = []
+    if batch:
+        _bulk_insert(batch)
+
+def add_authors_to_timeline(owner_id, author_ids):
+    """Backfill the latest posts of newly followed authors into one owner's timeline."""
+    add_authors_to_timelines([owner_id], author_ids)
+
+def remove_authors_from_timeline(owner_ids, author_ids):
+    return TimelineEntry.objects.filter(owner_id__in=owner_ids, author_id__in=author_ids).delete()[0]
+
+def push_demoted_authors():
+    """Fan out the skipped posts of authors that are no longer over the follower threshold.
+
+    Like a new follow, only the latest FEED_FOLLOW_BACKFILL posts of each author are pushed.
+    Returns the number of authors handled.
+    """
+    unfanned = Post.objects.filter(fanned_out=False)
+    if settings.FEED_HYBRID_FOLLOWER_THRESHOLD > 0:
+        unfanned = unfanned.exclude(author__followers_count__gte=settings.FEED_HYBRID_FOLLOWER_THRESHOLD)
+    author_ids = list(unfanned.values_list("author_id", flat=True).distinct())
+    for author_id in author_ids:
+        pending = unfanned.filter(author_id=author_id)
+        # Posts created while this runs are still skipped (cached pull set) and kept for the next run
+        last_id = pending.order_by("-id").values_list("id", flat=True).first()
+        recent = pending.filter(id__lte=last_id).order_by("-created_at", "-id")[:settings.FEED_FOLLOW_BACKFILL]
+        for post in recent.only("id", "author_id", "created_at"):
+            fan_out_post(post)
+        pending.filter(id__lte=last_id).update(fanned_out=True)
+    return len(author_ids)
+
+def rebuild_timeline(owner_id):
+    """Recompute one owner's timeline from the follow graph (used by backfill_timelines)."""
+    author_ids = list(get_user_model().objects.filter(followers=owner_id).values_list("id", flat=True))
+    TimelineEntry.objects.filter(owner_id=owner_id).exclude(author_id__in=author_ids).delete()
+    add_authors_to_timeline(owner_id, author_ids)
+    return len(author_ids)
@@ -0,0 +1,102 @@
+"""Time-decayed engagement ("trending") scores with forward decay.
+
+An interaction of weight w at time t adds w * exp(lambda * (t - epoch)) to Post.trending_score,
+with lambda = ln 2 / TRENDING_HALF_LIFE_HOURS. Old scores never need rewriting for ordering to
+stay correct: the current value of every post is score * exp(-lambda * (now - epoch)), the same
+factor for all. Each post records the epoch its score is relative to (Post.trending_epoch).
+Likes and comments (and their removal) fold the change into their counter UPDATE, which reads
+TrendingState.epoch in SQL and rebases the row onto it first, so no process ever works from a
+stale epoch. `manage.py update_trending` periodically moves the epoch to now, then rebases the
+posts with engagement in batches (each its own short transaction) and zeroes negligible scores.
+NumPy keeps a running top TRENDING_TOP_K, stored in TrendingState for the trending endpoint.
+"""
+import math
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Subquery, Value, When
+from django.db.models.functions import Coalesce, Exp, Greatest
+from django.db.models.lookups import LessThan
+
+from social_media_api import metrics
+
+from .models import Post, TrendingState
+from . import cache as response_cache
+
+def decay_rate():
+    return math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+
+def _epoch():
+    # Before the first update_trending there is no state row; keep each post's own epoch
+    stored = Subquery(TrendingState.objects.filter(pk=1).values("epoch")[:1], output_field=FloatField())
+    return Coalesce(stored, F("trending_epoch"), output_field=FloatField())
+
+def _rebased(epoch):
+    """trending_score moved from the row's epoch to `epoch` (an expression)."""
+    return F("trending_score") * Exp((F("trending_epoch") - epoch) * decay_rate(), output_field=FloatField())
+
+def score_update(weight, when=None):
+    """UPDATE fields for trending_score adding (negative weight: removing) an interaction at `when`.
+
+    Use as `Post.objects.filter(...).update(**score_update(...))`.
+    """
+    ts = when.timestamp() if when is not None else time.time()
+    epoch = _epoch()
+    score = _rebased(epoch) + weight * Exp((Value(ts) - epoch) * decay_rate(), output_field=FloatField())
+    if weight < 0:
+        # Contributions zeroed by a renormalization must not go negative when removed
+        score = Greatest(score, Value(0.0), output_field=FloatField())
+    # trending_score is assigned first, so it still reads the row's old epoch
+    return {"trending_score": score, "trending_epoch": epoch}
+
+def renormalize(batch_size=5000, top_k=None, now=None):
+    """Move the epoch to `now`, rebase every positive score, and store the new top-K ids."""
+    top_k = top_k or settings.TRENDING_TOP_K
+    now = now or time.time()
+    floor = settings.TRENDING_MIN_SCORE
+    best_ids, best_scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    rescaled = 0
+
+    # From here on likes and comments rebase the rows they touch onto the new epoch themselves
+    with transaction.atomic():
+        TrendingState.objects.select_for_update().get_or_create(pk=1)
+        TrendingState.objects.filter(pk=1).update(epoch=now)
+
+    rebased = _rebased(Value(now))
+    last_id = 0
+    while True:
+        ids = list(
+            Post.objects.filter(id__gt=last_id, trending_score__gt=0).order_by("id").values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        last_id = ids[-1]
+        with transaction.atomic():
+            # Computed in the UPDATE itself, so a concurrent like is never overwritten; rows a like
+            # already moved to `now` get a factor of 1
+            batch = Post.objects.filter(id__in=ids)
+            batch.update(
+                trending_score=Case(When(LessThan(rebased, floor), then=Value(0.0)), default=rebased),
+                trending_epoch=Value(now),
+            )
+            rows = list(batch.filter(trending_score__gt=0).values_list("id", "trending_score"))
+        rescaled += len(ids)
+
+        # Running top-K across batches: concatenate, then keep the k largest
+        best_ids = np.concatenate([best_ids, np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))])
+        best_scores = np.concatenate([best_scores, np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))])
+        if len(best_ids) > top_k:
+            keep = np.argpartition(-best_scores, top_k - 1)[:top_k]
+            best_ids, best_scores = best_ids[keep], best_scores[keep]
+
+    order = np.lexsort((-best_ids, -best_scores))
+    top_ids = best_ids[order].tolist()
+    with transaction.atomic():
+        state = TrendingState.objects.select_for_update().get(pk=1)
+        state.top_ids = top_ids
+        state.save(update_fields=["top_ids", "computed_at"])
+        transaction.on_commit(lambda: response_cache.bump("trending"))
+    metrics.incr("trending.renormalized", rescaled)
+    return rescaled, top_ids
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PostViewSet, CommentViewSet, FeedAPIView, LikePostAPIView, UnlikePostAPIView
+from .views import PostViewSet, CommentViewSet, FeedAPIView, LikePostAPIView, UnlikePostAPIView, TrendingAPIView
 
 router = DefaultRouter()
 router.register(r"posts", PostViewSet, basename="posts")
@@ -8,6 +8,7 @@ router.register(r"comments", CommentViewSet, basename="comments")
 
 urlpatterns = [
     path("feed/", FeedAPIView.as_view(), name="feed"),
+    path("trending/", TrendingAPIView.as_view(), name="trending"),
     path("posts/<int:pk>/like/", LikePostAPIView.as_view(), name="like-post"),
     path("posts/<int:pk>/unlike/", UnlikePostAPIView.as_view(), name="unlike-post"),
     path("", include(router.urls)),
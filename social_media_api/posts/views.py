@@ -1,21 +1,37 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
 from rest_framework import viewsets, status, permissions, generics
 from rest_framework.response import Response
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 
-from .models import Post, Comment, Like
+from .models import Post, Comment, Like, TrendingState
+from .feed import HybridFeed
+from .cache import cached_response
+from .search import FullTextSearchFilter
+from . import trending
 from .serializers import PostSerializer, CommentSerializer
 from .permissions import IsOwnerOrReadOnly
 
-from notifications.models import Notification
+from notifications.utils import notify
 
 class PostViewSet(viewsets.ModelViewSet):
-    queryset = Post.objects.all().order_by("-created_at")
+    queryset = Post.objects.select_related("author").order_by("-created_at")
     serializer_class = PostSerializer
-    filter_backends = [SearchFilter, OrderingFilter]
+    # Relevance-ranked full-text search (FTS5 / tsvector); search_fields is the icontains fallback
+    filter_backends = [FullTextSearchFilter, OrderingFilter]
     search_fields = ["title", "content"]
     ordering_fields = ["created_at", "updated_at"]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def list(self, request, *args, **kwargs):
+        build = lambda: super(PostViewSet, self).list(request, *args, **kwargs)
+        return cached_response(request, "posts", ["posts"], build)
+
+    def retrieve(self, request, *args, **kwargs):
+        build = lambda: super(PostViewSet, self).retrieve(request, *args, **kwargs)
+        return cached_response(request, "post", [f"post:{kwargs.get('pk')}"], build)
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
@@ -41,16 +57,26 @@ class CommentViewSet(viewsets.ModelViewSet):
             qs = qs.filter(post_id=post_id)
         return qs
 
+    @transaction.atomic
     def perform_create(self, serializer):
         comment = serializer.save(author=self.request.user)
-        if comment.post.author != self.request.user:
-            Notification.objects.create(
-                recipient=comment.post.author,
-                actor=self.request.user,
-                verb="commented on your post",
-                target_content_type=None,
-                target_object_id=comment.post.id,
-            )
+        Post.objects.filter(pk=comment.post_id).update(
+            comments_count=F("comments_count") + 1,
+            **trending.score_update(settings.TRENDING_COMMENT_WEIGHT, comment.created_at),
+        )
+        notify(
+            recipient=comment.post.author, actor=self.request.user, verb="commented on your post",
+            target=comment.post, action_object=comment,
+        )
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        post_id, created_at = instance.post_id, instance.created_at
+        instance.delete()
+        Post.objects.filter(pk=post_id, comments_count__gt=0).update(
+            comments_count=F("comments_count") - 1,
+            **trending.score_update(-settings.TRENDING_COMMENT_WEIGHT, created_at),
+        )
 
     def check_object_permissions(self, request, obj):
         if request.method in ["PUT", "PATCH", "DELETE"] and obj.author != request.user:
@@ -61,6 +87,20 @@ class FeedAPIView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
+        build = lambda: self.build_feed(request)
+        return cached_response(request, "feed", ["posts", f"graph:{request.user.pk}"], build)
+
+    def build_feed(self, request):
+        if settings.FEED_FANOUT:
+            # Pushed timeline (indexed range scan) merged with pulled high-follower authors
+            feed_posts = HybridFeed(request.user)
+            page = self.paginate_queryset(feed_posts)
+            if page is not None:
+                serializer = PostSerializer(page, many=True, context={"request": request})
+                return self.get_paginated_response(serializer.data)
+            serializer = PostSerializer(feed_posts[:settings.FEED_FANOUT_BATCH_SIZE], many=True, context={"request": request})
+            return Response(serializer.data)
+
         # Required by checker:
         following_users = request.user.following.all()
         feed_posts = Post.objects.filter(author__in=following_users).order_by("-created_at")
@@ -76,18 +116,17 @@ class LikePostAPIView(generics.GenericAPIView):
 
     def post(self, request, pk: int, *args, **kwargs):
         post = generics.get_object_or_404(Post, pk=pk)
-        like, created = Like.objects.get_or_create(user=request.user, post=post)
+        with transaction.atomic():
+            like, created = Like.objects.get_or_create(user=request.user, post=post)
+            if created:
+                Post.objects.filter(pk=post.pk).update(
+                    likes_count=F("likes_count") + 1,
+                    **trending.score_update(settings.TRENDING_LIKE_WEIGHT, like.created_at),
+                )
         if not created:
             return Response({"detail": "Already liked."}, status=400)
 
-        if post.author != request.user:
-            Notification.objects.create(
-                recipient=post.author,
-                actor=request.user,
-                verb="liked your post",
-                target_content_type=None,
-                target_object_id=post.id,
-            )
+        notify(recipient=post.author, actor=request.user, verb="liked your post", target=post)
         return Response({"detail": "Liked."}, status=status.HTTP_201_CREATED)
 
 class UnlikePostAPIView(generics.GenericAPIView):
@@ -95,7 +134,28 @@ class UnlikePostAPIView(generics.GenericAPIView):
 
     def post(self, request, pk: int, *args, **kwargs):
         post = generics.get_object_or_404(Post, pk=pk)
-        deleted, _ = Like.objects.filter(user=request.user, post=post).delete()
+        with transaction.atomic():
+            like = Like.objects.filter(user=request.user, post=post).first()
+            deleted = like.delete()[0] if like else 0
+            if deleted:
+                # Remove exactly what the like added, at the time it was made
+                Post.objects.filter(pk=post.pk, likes_count__gt=0).update(
+                    likes_count=F("likes_count") - 1,
+                    **trending.score_update(-settings.TRENDING_LIKE_WEIGHT, like.created_at),
+                )
         if deleted == 0:
             return Response({"detail": "You haven't liked this post."}, status=400)
         return Response({"detail": "Unliked."}, status=200)
+
+class TrendingAPIView(generics.GenericAPIView):
+    """Top posts by decayed engagement, precomputed by `manage.py update_trending`."""
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def get(self, request, *args, **kwargs):
+        return cached_response(request, "trending", ["posts", "trending"], lambda: self.build(request))
+
+    def build(self, request):
+        ids = TrendingState.objects.filter(pk=1).values_list("top_ids", flat=True).first() or []
+        posts = Post.objects.select_related("author").in_bulk(ids)
+        serializer = PostSerializer([posts[i] for i in ids if i in posts], many=True, context={"request": request})
+        return Response({"results": serializer.data})
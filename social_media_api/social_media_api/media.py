@@ -0,0 +1,138 @@
+"""MEDIA_URL view: Django checks access, the front proxy moves the bytes.
+
+MEDIA_SERVE_MODE picks the hand-off:
+- "accel":    X-Accel-Redirect to MEDIA_ACCEL_PREFIX + path (nginx `internal` location)
+- "sendfile": X-Sendfile with the absolute file path (Apache mod_xsendfile, lighttpd)
+- "django":   stream from storage with single-range support (opt-in, development only)
+Storages without local paths (S3) get a redirect to the storage URL. Avatar variants
+("avatars/<user>/<16 hex>-...", content-hashed by accounts.avatars) are served `immutable`
+with the hash as ETag and never touch the disk for conditional requests; other files get a
+stat-based ETag. With MEDIA_REQUIRE_AUTH every response is `private`.
+"""
+import mimetypes
+import posixpath
+import re
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+# Only names written by accounts.avatars are known to be content-hashed
+HASHED_NAME_RE = re.compile(r"^avatars/\d+/(?P<hash>[0-9a-f]{16})-[^/]+$")
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE = "max-age=31536000, immutable"
+
+def _safe_name(path):
+    name = posixpath.normpath(path).lstrip("/")
+    if name in ("", ".") or name.startswith("..") or "\\" in name:
+        raise Http404("Not found.")
+    if any(name.startswith(prefix) for prefix in settings.MEDIA_PRIVATE_PREFIXES):
+        raise Http404("Not found.")
+    return name
+
+def _local_path(name):
+    try:
+        return default_storage.path(name)
+    except NotImplementedError:
+        return None
+
+def _read_range(name, start, length):
+    with default_storage.open(name, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+def _parse_range(header, size):
+    """(start, end) inclusive for a single satisfiable byte range, None to send everything."""
+    match = RANGE_RE.match(header or "")
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    return (start, end) if start <= end else False
+
+class MediaView(APIView):
+    def get_permissions(self):
+        if settings.MEDIA_REQUIRE_AUTH:
+            return [permissions.IsAuthenticated()]
+        return [permissions.AllowAny()]
+
+    def get(self, request, path):
+        name = _safe_name(path)
+        hashed = HASHED_NAME_RE.match(name)
+        local_path = _local_path(name)
+        if local_path is None:
+            # Remote storage: the client fetches from the bucket/CDN directly
+            return HttpResponseRedirect(default_storage.url(name))
+
+        # Shared caches must not keep copies of files that need a token
+        visibility = "private" if settings.MEDIA_REQUIRE_AUTH else "public"
+        if hashed:
+            etag, last_modified, size = f'"{hashed.group("hash")}"', None, None
+            cache_control = f"{visibility}, {IMMUTABLE}"
+        else:
+            try:
+                size = default_storage.size(name)
+                modified = default_storage.get_modified_time(name)
+            except (FileNotFoundError, OSError):
+                raise Http404("Not found.")
+            last_modified = int(modified.replace(tzinfo=modified.tzinfo or dt_timezone.utc).timestamp())
+            etag = f'"{last_modified:x}-{size:x}"'
+            cache_control = f"{visibility}, max-age={settings.MEDIA_CACHE_SECONDS}"
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self._transfer(request, name, local_path, size, etag)
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def _transfer(self, request, name, local_path, size, etag):
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        mode = settings.MEDIA_SERVE_MODE
+        if mode in ("accel", "sendfile"):
+            # The proxy answers Range requests and 404s itself
+            response = HttpResponse(content_type=content_type)
+            if mode == "accel":
+                response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX.rstrip("/") + "/" + name
+            else:
+                response["X-Sendfile"] = local_path
+            response["Accept-Ranges"] = "bytes"
+            return response
+
+        if size is None:
+            try:
+                size = default_storage.size(name)
+            except (FileNotFoundError, OSError):
+                raise Http404("Not found.")
+        byte_range = None
+        if request.headers.get("If-Range", etag) == etag:
+            byte_range = _parse_range(request.headers.get("Range"), size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        start, end = byte_range or (0, size - 1)
+        response = StreamingHttpResponse(
+            _read_range(name, start, end - start + 1), status=206 if byte_range else 200, content_type=content_type
+        )
+        if byte_range:
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+        response["Accept-Ranges"] = "bytes"
+        return response
@@ -0,0 +1,50 @@
+"""Tiny in-process metrics registry (counters, timers, gauges) exposed at /api/metrics/.
+
+Values are per worker process; scrape every worker or aggregate upstream.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_counters = {}
+_timers = {}
+_gauges = {}
+
+def incr(name, value=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+def observe(name, ms):
+    with _lock:
+        count, total, peak = _timers.get(name, (0, 0.0, 0.0))
+        _timers[name] = (count + 1, total + ms, max(peak, ms))
+
+@contextmanager
+def timer(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - start) * 1000)
+
+def gauge(name, value):
+    """Set a gauge; `value` may be a callable evaluated lazily at snapshot time."""
+    with _lock:
+        _gauges[name] = value
+
+def snapshot():
+    with _lock:
+        counters = dict(_counters)
+        timers = {
+            name: {"count": c, "avg_ms": round(t / c, 3) if c else 0.0, "max_ms": round(m, 3)}
+            for name, (c, t, m) in _timers.items()
+        }
+        gauges = dict(_gauges)
+    gauges = {name: (value() if callable(value) else value) for name, value in gauges.items()}
+    return {"counters": counters, "timers": timers, "gauges": gauges}
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timers.clear()
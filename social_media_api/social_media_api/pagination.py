@@ -0,0 +1,199 @@
+"""Keyset (cursor) pagination: every page is an indexed range scan, no COUNT(*) and no OFFSET."""
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+DEFAULT_ORDERING = ("-created_at", "-id")
+
+def _flip(field):
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+def _after(ordering, values):
+    """Rows strictly after `values` in `ordering`, i.e. a row-value comparison expanded for mixed directions."""
+    q = None
+    for field, value in reversed(list(zip(ordering, values))):
+        name, op = field.lstrip("-"), ("lt" if field.startswith("-") else "gt")
+        strict = Q(**{f"{name}__{op}": value})
+        q = strict if q is None else strict | (Q(**{name: value}) & q)
+    # Inclusive bound on the leading column keeps the scan on the composite index range
+    first, value = ordering[0], values[0]
+    return Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": value}) & q
+
+def keyset_filter(queryset, ordering, position=None, reverse=False, since=None, until=None):
+    """Order `queryset` by `ordering` and keep rows after `position` (walking backwards if `reverse`).
+
+    `since`/`until` bound the leading (timestamp) column: `since` exclusive, `until` inclusive.
+    """
+    lead = ordering[0].lstrip("-")
+    if since is not None:
+        queryset = queryset.filter(**{f"{lead}__gt": since})
+    if until is not None:
+        queryset = queryset.filter(**{f"{lead}__lte": until})
+    if reverse:
+        ordering = [_flip(f) for f in ordering]
+    if position is not None:
+        queryset = queryset.filter(_after(ordering, position))
+    return queryset.order_by(*ordering)
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        # None for unparseable strings, rejected by decode_cursor
+        return parse_datetime(value["dt"])
+    return value
+
+class KeysetPagination(BasePagination):
+    """Opaque cursor pagination keyed on the queryset ordering plus an `id` tie-breaker.
+
+    Defaults to `(created_at, id)` newest first. Any `?ordering=` applied by OrderingFilter is
+    honoured. Sliceable non-queryset sources (e.g. the hybrid feed) implement `keyset_window()`.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    since_query_param = "since"
+    until_query_param = "until"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        if not isinstance(queryset, QuerySet):
+            return DEFAULT_ORDERING
+        ordering = [f for f in (queryset.query.order_by or queryset.model._meta.ordering) if isinstance(f, str)]
+        if not ordering:
+            return DEFAULT_ORDERING
+        if ordering[-1].lstrip("-") not in ("id", "pk"):
+            ordering.append("-id" if ordering[0].startswith("-") else "id")
+        return tuple(ordering)
+
+    def decode_cursor(self, request, queryset=None):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            values = [_decode_value(v) for v in data["k"]]
+            reverse = bool(data.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        if not all(self._valid_value(queryset, f, v) for f, v in zip(self.ordering, values)):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    @staticmethod
+    def _valid_value(queryset, field, value):
+        """Whether a decoded cursor value can be compared with `field` (tampered cursors cannot)."""
+        if value is None or isinstance(value, (list, dict)):
+            return False
+        model = getattr(queryset, "model", None)
+        name = field.lstrip("-")
+        if model is None:
+            # keyset_window() sources: (created_at, id) keys
+            return isinstance(value, datetime) if name == "created_at" else isinstance(value, int)
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations such as search_rank are numeric
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+        if isinstance(model_field, models.DateTimeField):
+            return isinstance(value, datetime)
+        try:
+            model_field.to_python(value)
+        except Exception:
+            return False
+        return True
+
+    def encode_cursor(self, obj, reverse):
+        values = [_encode_value(getattr(obj, f.lstrip("-"))) for f in self.ordering]
+        encoded = base64.urlsafe_b64encode(json.dumps({"k": values, "r": int(reverse)}).encode("utf-8"))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode("ascii"))
+
+    def _time_bound(self, request, queryset, param):
+        raw = request.query_params.get(param)
+        if not raw:
+            return None
+        try:
+            value = parse_datetime(raw)
+        except ValueError:
+            value = None
+        if value is None:
+            raise ValidationError({param: "Expected an ISO-8601 timestamp."})
+        lead = self.ordering[0].lstrip("-")
+        model = getattr(queryset, "model", None)
+        if model is not None:
+            try:
+                if not isinstance(model._meta.get_field(lead), models.DateTimeField):
+                    return None
+            except FieldDoesNotExist:
+                return None
+        return value
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+        self.ordering = self.get_ordering(queryset)
+        position, reverse = self.decode_cursor(request, queryset)
+        since = self._time_bound(request, queryset, self.since_query_param)
+        until = self._time_bound(request, queryset, self.until_query_param)
+
+        if hasattr(queryset, "keyset_window"):
+            rows = queryset.keyset_window(position, reverse, since, until, self.page_size + 1)
+        else:
+            rows = list(keyset_filter(queryset, self.ordering, position, reverse, since, until)[: self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = position is not None if not reverse else has_more
+        self.page = rows
+        return rows
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 import dj_database_url
 
@@ -79,6 +80,21 @@ DATABASES = {
     )
 }
 
+# Cache (local memory by default; point CACHE_BACKEND/CACHE_LOCATION at Redis/Memcached in production,
+# or at django.core.cache.backends.filebased.FileBasedCache for a shared local stand-in)
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "social-media-api"),
+    },
+    # Entries every process must see (stream wake-ups); file-based so the web and worker processes
+    # on one host share it out of the box. Use Redis/Memcached when processes span hosts.
+    "shared": {
+        "BACKEND": os.getenv("SHARED_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": os.getenv("SHARED_CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "social-media-api")),
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -98,21 +114,124 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# MEDIA_URL is answered by social_media_api.media: "accel" (nginx X-Accel-Redirect to
+# MEDIA_ACCEL_PREFIX), "sendfile" (X-Sendfile) or, opt-in for development, "django" (streams itself)
+MEDIA_SERVE_MODE = os.getenv("MEDIA_SERVE_MODE", "accel")
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+MEDIA_REQUIRE_AUTH = os.getenv("MEDIA_REQUIRE_AUTH", "False").lower() in ["true", "1", "yes"]
+MEDIA_CACHE_SECONDS = int(os.getenv("MEDIA_CACHE_SECONDS", "3600"))
+# Never served (unfinished chunked upload parts)
+MEDIA_PRIVATE_PREFIXES = ["uploads/"]
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "accounts.CustomUser"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "accounts.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # Opaque (created_at, id) cursors with ?since=/?until= polling; no COUNT(*) or OFFSET
+    "DEFAULT_PAGINATION_CLASS": "social_media_api.pagination.KeysetPagination",
     "PAGE_SIZE": 10,
 }
 
+# CachedTokenAuthentication: seconds a token->user lookup is reused (0 disables) and the CACHES
+# alias holding the entries, shared so revocations reach every worker at once. An empty alias
+# uses a per-process LRU of TOKEN_AUTH_CACHE_SIZE entries instead: single-process deployments
+# only, since other workers keep accepting a deleted token for up to TOKEN_AUTH_CACHE_TTL seconds.
+TOKEN_AUTH_CACHE_TTL = int(os.getenv("TOKEN_AUTH_CACHE_TTL", "60"))
+TOKEN_AUTH_CACHE_SIZE = int(os.getenv("TOKEN_AUTH_CACHE_SIZE", "10000"))
+TOKEN_AUTH_CACHE_ALIAS = os.getenv("TOKEN_AUTH_CACHE_ALIAS", "shared")
+
+# Avatar variants (accounts.avatars): square sizes rendered as WebP + JPEG in a process pool
+# (AVATAR_WORKERS=0 means one process per core); AVATAR_PROCESSING_SYNC renders inline instead
+AVATAR_VARIANT_SIZES = [int(s) for s in os.getenv("AVATAR_VARIANT_SIZES", "64,128,256").split(",")]
+AVATAR_WORKERS = int(os.getenv("AVATAR_WORKERS", "0"))
+AVATAR_PROCESSING_SYNC = os.getenv("AVATAR_PROCESSING_SYNC", "False").lower() in ["true", "1", "yes"]
+
+# Chunked profile picture uploads (accounts.uploads): byte limits and how long unfinished
+# sessions are kept before `manage.py prune_upload_sessions` removes them
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", str(20 * 1024 * 1024)))
+UPLOAD_PART_MAX_SIZE = int(os.getenv("UPLOAD_PART_MAX_SIZE", str(5 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+
+# In-process follow graph index (accounts.graph): full reload interval in seconds, bounding how
+# long changes made by other worker processes take to show up in counts/membership
+FOLLOW_GRAPH_TTL = int(os.getenv("FOLLOW_GRAPH_TTL", "60"))
+
+# "People you may know": suggestions kept per user by `manage.py compute_suggestions`
+SUGGESTIONS_TOP_K = int(os.getenv("SUGGESTIONS_TOP_K", "20"))
+
+# Home feed: fan-out-on-write timelines (FEED_FANOUT=False falls back to the live follow join)
+FEED_FANOUT = os.getenv("FEED_FANOUT", "True").lower() in ["true", "1", "yes"]
+FEED_FANOUT_BATCH_SIZE = int(os.getenv("FEED_FANOUT_BATCH_SIZE", "1000"))
+# Recent posts copied into a timeline when following someone new
+FEED_FOLLOW_BACKFILL = int(os.getenv("FEED_FOLLOW_BACKFILL", "200"))
+# Hybrid push/pull: authors with at least this many followers are not fanned out but merged
+# into feeds at read time (0 disables pulling). The author set is cached for N seconds.
+FEED_HYBRID_FOLLOWER_THRESHOLD = int(os.getenv("FEED_HYBRID_FOLLOWER_THRESHOLD", "10000"))
+FEED_HYBRID_CACHE_SECONDS = int(os.getenv("FEED_HYBRID_CACHE_SECONDS", "300"))
+
+# Post search backend (posts.search): "auto" follows the database (tsvector on Postgres, FTS5
+# on SQLite), or force "postgres", "sqlite" or "like" (plain icontains)
+POST_SEARCH_BACKEND = os.getenv("POST_SEARCH_BACKEND", "auto")
+
+# Trending posts (posts.trending): decay half-life, interaction weights, size of the stored
+# top-K and the score below which `update_trending` drops a post from the candidates
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "12"))
+TRENDING_LIKE_WEIGHT = float(os.getenv("TRENDING_LIKE_WEIGHT", "1"))
+TRENDING_COMMENT_WEIGHT = float(os.getenv("TRENDING_COMMENT_WEIGHT", "2"))
+TRENDING_TOP_K = int(os.getenv("TRENDING_TOP_K", "100"))
+TRENDING_MIN_SCORE = float(os.getenv("TRENDING_MIN_SCORE", "0.01"))
+
+# Versioned response cache for posts list/detail and feed (seconds)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() in ["true", "1", "yes"]
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "30"))
+# How long a stale copy may still be served while one worker rebuilds it
+RESPONSE_CACHE_STALE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_STALE_TIMEOUT", "300"))
+RESPONSE_CACHE_LOCK_TIMEOUT = 10
+RESPONSE_CACHE_LOCK_WAIT = 2.0
+
+# Notifications are enqueued in an outbox and written in bulk by
+# `python manage.py process_notification_outbox` (False = write inside the request)
+NOTIFICATIONS_ASYNC = os.getenv("NOTIFICATIONS_ASYNC", "True").lower() in ["true", "1", "yes"]
+# Unread notifications with the same (recipient, verb, target) within this many seconds are
+# grouped into one row ("alice and 41 others liked your post"); 0 disables grouping
+NOTIFICATION_AGGREGATION_WINDOW = int(os.getenv("NOTIFICATION_AGGREGATION_WINDOW", str(6 * 60 * 60)))
+NOTIFICATION_RECENT_ACTORS = 3
+# Read notifications older than this are removed by `python manage.py prune_notifications`
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+
+# Email digests (`python manage.py send_notification_digests`, e.g. from cron once per window)
+NOTIFICATION_DIGEST_WINDOW_HOURS = int(os.getenv("NOTIFICATION_DIGEST_WINDOW_HOURS", "24"))
+NOTIFICATION_DIGEST_MAX_ITEMS = 20
+
+# Server-Sent Events stream (/api/notifications/stream/, served by social_media_api.asgi).
+# CacheBroker reaches streams in every process through NOTIFICATION_STREAM_CACHE_ALIAS; the
+# in-process broker only works with NOTIFICATIONS_ASYNC=False and a single ASGI process
+# (a system check rejects it, or a per-process cache, while the outbox worker delivers).
+NOTIFICATION_STREAM_BROKER = os.getenv("NOTIFICATION_STREAM_BROKER", "notifications.pubsub.CacheBroker")
+NOTIFICATION_STREAM_CACHE_ALIAS = os.getenv("NOTIFICATION_STREAM_CACHE_ALIAS", "shared")
+NOTIFICATION_STREAM_HEARTBEAT = 15  # seconds between keep-alive comments
+NOTIFICATION_STREAM_POLL_INTERVAL = 1.0  # CacheBroker only
+NOTIFICATION_STREAM_MAX_SECONDS = 300  # then the client reconnects with Last-Event-ID
+NOTIFICATION_STREAM_RETRY_MS = 3000
+NOTIFICATION_STREAM_BATCH = 50
+
+# Email (SMTP relay; the test runner swaps in the locmem backend)
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False").lower() in ["true", "1", "yes"]
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "no-reply@localhost")
+
 # Required security settings (strings must exist for checker)
 SECURE_BROWSER_XSS_FILTER = True
 X_FRAME_OPTIONS = "DENY"
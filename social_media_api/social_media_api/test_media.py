@@ -0,0 +1,72 @@
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+
+AVATAR = "avatars/1/0123456789abcdef-64.webp"
+
+
+class MediaViewTests(APITestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        overrides = override_settings(MEDIA_ROOT=media_root.name, MEDIA_SERVE_MODE="django")
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        default_storage.save("profile_pictures/a.txt", ContentFile(b"0123456789"))
+        default_storage.save(AVATAR, ContentFile(b"webp"))
+        default_storage.save("uploads/1/00000.part", ContentFile(b"secret"))
+
+    def test_full_response_and_conditional_get(self):
+        response = self.client.get("/media/profile_pictures/a.txt")
+        self.assertEqual((response.status_code, b"".join(response.streaming_content)), (200, b"0123456789"))
+        self.assertEqual(response["Cache-Control"], "public, max-age=3600")
+        again = self.client.get("/media/profile_pictures/a.txt", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_ranges(self):
+        response = self.client.get("/media/profile_pictures/a.txt", HTTP_RANGE="bytes=2-4")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-4/10")
+        self.assertEqual(b"".join(response.streaming_content), b"234")
+        suffix = self.client.get("/media/profile_pictures/a.txt", HTTP_RANGE="bytes=-3")
+        self.assertEqual(b"".join(suffix.streaming_content), b"789")
+        self.assertEqual(self.client.get("/media/profile_pictures/a.txt", HTTP_RANGE="bytes=20-").status_code, 416)
+
+    def test_traversal_private_and_missing_are_404(self):
+        for path in ("/media/../settings.py", "/media/uploads/1/00000.part", "/media/missing.txt"):
+            self.assertEqual(self.client.get(path).status_code, 404, path)
+
+    def test_hashed_avatars_are_immutable(self):
+        response = self.client.get(f"/media/{AVATAR}")
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertEqual(response["ETag"], '"0123456789abcdef"')
+        self.assertEqual(self.client.get(f"/media/{AVATAR}", HTTP_IF_NONE_MATCH='"0123456789abcdef"').status_code, 304)
+
+    def test_hash_like_names_elsewhere_are_not_immutable(self):
+        default_storage.save("profile_pictures/0123456789abcdef-me.txt", ContentFile(b"me"))
+        response = self.client.get("/media/profile_pictures/0123456789abcdef-me.txt")
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    @override_settings(MEDIA_REQUIRE_AUTH=True)
+    def test_auth_required_and_private(self):
+        self.assertEqual(self.client.get("/media/profile_pictures/a.txt").status_code, 401)
+        self.client.force_authenticate(CustomUser.objects.create_user("viewer", password="pass12345"))
+        self.assertEqual(self.client.get(f"/media/{AVATAR}")["Cache-Control"], "private, max-age=31536000, immutable")
+        self.assertTrue(self.client.get("/media/profile_pictures/a.txt")["Cache-Control"].startswith("private"))
+
+    @override_settings(MEDIA_SERVE_MODE="accel")
+    def test_accel_hands_off_to_the_proxy(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(f"/media/{AVATAR}")
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{AVATAR}")
+        self.assertEqual(response.content, b"")
+
+    @override_settings(MEDIA_SERVE_MODE="sendfile")
+    def test_sendfile(self):
+        response = self.client.get("/media/profile_pictures/a.txt")
+        self.assertTrue(response["X-Sendfile"].endswith("profile_pictures/a.txt"))
@@ -0,0 +1,9 @@
+"""Settings for the test suite: `python manage.py test --settings=social_media_api.test_settings`."""
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+
+SECURE_SSL_REDIRECT = False
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+# A fresh directory per run, so the shared cache never carries entries between runs
+CACHES["shared"]["LOCATION"] = tempfile.mkdtemp(prefix="social-media-api-tests-")  # noqa: F405
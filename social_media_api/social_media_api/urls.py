@@ -1,7 +1,12 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, include, re_path
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+
+from . import metrics
+from .media import MediaView
 
 class HealthView(APIView):
     authentication_classes = []
@@ -9,10 +14,17 @@ class HealthView(APIView):
     def get(self, request):
         return Response({"status": "ok"})
 
+class MetricsView(APIView):
+    permission_classes = [IsAdminUser]
+    def get(self, request):
+        return Response(metrics.snapshot())
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/health/", HealthView.as_view()),
+    path("api/metrics/", MetricsView.as_view()),
     path("api/accounts/", include("accounts.urls")),
     path("api/posts/", include("posts.urls")),
     path("api/notifications/", include("notifications.urls")),
+    re_path(rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.+)$", MediaView.as_view(), name="media"),
 ]